@@ -0,0 +1,148 @@
+"""
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ source ../env_bh_selenium/bin/activate
+  (env_bh_selenium) $ python3 ./bench.py --iterations 5
+  (env_bh_selenium) $ python3 ./bench.py --iterations 10 --checks JohnHayCheck BrownResultsCheck --reuse-browser
+  (env_bh_selenium) $ python3 ./bench.py --iterations 5 --compare-lean
+
+Times every check, broken into phases, over repeated iterations...
+- `launch`: browser start-up -- a fresh browser per check per iteration, unless `--reuse-browser`
+- `warmup`: the check's `warm_bibs` availability-cache warm-up
+- `navigation`, `readiness`: `load_page()`'s page-load, then the wait for availability data
+- `extract`: the DOM lookups
+- `assert`: the assertions
+...plus the browser's process-tree memory after each check (`rss_mb`), and writes medians and p95s, as json, to `bench_output.txt`.
+
+`--compare-lean` runs everything twice -- full browsers, then `lib/browser_pool.py` lean browsers -- and adds the per-check differences.
+
+Point `BLK_HAY__ROOT_PAGE_URL` at `lib/stand_in_server.py` to benchmark the harness itself, without the catalog.
+"""
+
+import argparse, datetime, json, logging, time
+
+import settings
+from lib import proc_stats, runner, warmup
+from lib.browser_pool import BrowserPool
+from lib.stats import summarize
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+    datefmt='%d/%b/%Y %H:%M:%S' )
+log = logging.getLogger(__name__)
+
+
+def bench_check( name, pool ):
+    """ Runs one check once; returns its per-phase seconds, whether it passed, and the pool's browser memory afterwards.
+        Called by run_bench() """
+    start = time.perf_counter()
+    warmup.warm_up( [runner.CHECKS[name]] )
+    phases = { 'warmup': time.perf_counter() - start }
+    result = runner.run_named_check( name, pool )
+    phases['launch'] = result['phases'].pop( 'acquire', 0.0 )
+    phases.update( result['phases'] )
+    phases['total'] = time.perf_counter() - start
+    usages = [ usage for usage in (proc_stats.browser_usage(browser) for browser in pool.launched) if usage ]
+    rss_mb = sum( usage['rss_mb'] for usage in usages ) if usages else None
+    return ( phases, result['passed'], rss_mb )
+
+
+def run_bench( names, iterations, reuse_browser, lean=None ):
+    """ Collects per-check, per-phase samples over the iterations; returns the summary.
+        Called by main() """
+    samples = { name: {} for name in names }
+    memory = { name: [] for name in names }
+    failures = { name: 0 for name in names }
+    shared_pool = BrowserPool( size=1, lean=lean ) if reuse_browser else None
+    try:
+        for iteration in range( iterations ):
+            log.info( f'iteration `{iteration + 1}` of `{iterations}`' )
+            for name in names:
+                pool = shared_pool or BrowserPool( size=1, lean=lean )
+                try:
+                    ( phases, passed, rss_mb ) = bench_check( name, pool )
+                finally:
+                    if not shared_pool:
+                        pool.shutdown()
+                for ( phase, seconds ) in phases.items():
+                    samples[name].setdefault( phase, [] ).append( seconds )
+                failures[name] += 0 if passed else 1
+                if rss_mb is not None:
+                    memory[name].append( rss_mb )
+    finally:
+        if shared_pool:
+            shared_pool.shutdown()
+    return {
+        'run_at': datetime.datetime.now().isoformat(),
+        'root_page_url': settings.ROOT_PAGE_URL,
+        'iterations': iterations,
+        'reuse_browser': reuse_browser,
+        'lean': settings.LEAN_BROWSER if lean is None else lean,
+        'checks': {
+            name: {
+                'failures': failures[name],
+                'phases': {phase: summarize(values) for (phase, values) in samples[name].items()},
+                'rss_mb': summarize(memory[name]) if memory[name] else None }
+            for name in names } }
+
+
+def compare_lean( names, iterations, reuse_browser ):
+    """ Benchmarks full browsers, then lean ones; returns both summaries and the lean-minus-full median differences.
+        Called by main() """
+    full = run_bench( names, iterations, reuse_browser, lean=False )
+    lean = run_bench( names, iterations, reuse_browser, lean=True )
+    differences = {}
+    for name in names:
+        ( before, after ) = ( full['checks'][name], lean['checks'][name] )
+        differences[name] = {
+            phase: round( after['phases'][phase]['median'] - stats['median'], 3 )
+            for ( phase, stats ) in before['phases'].items() if phase in after['phases'] }
+        if before['rss_mb'] and after['rss_mb']:
+            differences[name]['rss_mb'] = round( after['rss_mb']['median'] - before['rss_mb']['median'], 1 )
+    return { 'full': full, 'lean': lean, 'lean_minus_full_medians': differences }
+
+
+def log_table( summary ):
+    lines = [ f'{"check":<24} {"phase":<12} {"median":>9} {"p95":>9}' ]
+    for ( name, data ) in summary['checks'].items():
+        for ( phase, stats ) in data['phases'].items():
+            lines.append( f'{name:<24} {phase:<12} {stats["median"]:>9} {stats["p95"]:>9}' )
+        if data['rss_mb']:
+            lines.append( f'{name:<24} {"rss_mb":<12} {data["rss_mb"]["median"]:>9} {data["rss_mb"]["p95"]:>9}' )
+    log.info( '\n' + '\n'.join(lines) )
+    return
+
+
+def parse_args():
+    parser = argparse.ArgumentParser( description='Per-phase benchmark of the checker harness.' )
+    parser.add_argument( '--iterations', type=int, default=5 )
+    parser.add_argument( '--checks', nargs='*', default=None, help='check-names; default, all' )
+    parser.add_argument( '--reuse-browser', action='store_true', help='share one browser across checks and iterations' )
+    parser.add_argument( '--compare-lean', action='store_true', help='benchmark full, then lean, browsers; see lib/browser_pool.py' )
+    parser.add_argument( '--output', default='bench_output.txt' )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    names = args.checks or list( runner.CHECKS )
+    unknown = [ name for name in names if name not in runner.CHECKS ]
+    assert not unknown, f'unknown check(s), ```{unknown}```'
+    if args.compare_lean:
+        summary = compare_lean( names, args.iterations, args.reuse_browser )
+        log_table( summary['full'] )
+        log_table( summary['lean'] )
+        log.info( f'lean-minus-full medians, ```{json.dumps(summary["lean_minus_full_medians"], indent=2)}```' )
+    else:
+        summary = run_bench( names, args.iterations, args.reuse_browser )
+        log_table( summary )
+    with open( args.output, 'w' ) as f:
+        f.write( json.dumps(summary, indent=2) )
+    log.info( f'benchmark written to ```{args.output}```' )
+    return
+
+
+if __name__ == '__main__':
+    main()
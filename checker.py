@@ -3,65 +3,132 @@ Usage: from 'blacklight_hay_FTcode' directory...
 
   $ source ../env_bh_selenium/bin/activate
   (env_bh_selenium) $ python3 ./checker.py
+  (env_bh_selenium) $ python3 ./checker.py --incremental  # skips checks whose pages haven't changed since they last passed; needs BLK_HAY__AVAILABILITY_URL_PATTERN
+  (env_bh_selenium) $ python3 ./checker.py --daemon  # re-runs on an interval, with warm browsers; see lib/daemon.py
+  (env_bh_selenium) $ python3 -m lib.history report  # flags checks that got slower; every run is recorded
+  (env_bh_selenium) $ python3 ./checker.py --shard-index 0 --shard-count 3  # this node's third of the suite; see lib/sharding.py
+  (env_bh_selenium) $ python3 ./checker.py --rerun-failed --repetitions 5  # flaky or consistent? see lib/failures.py
+  $ python3 ./checker.py --list --kind page --location 'ANNEX HAY'  # instant; no browser machinery is imported
+  $ python3 ./checker.py --dry-run --bib b2498067
+  (env_bh_selenium) $ python3 ./checker.py --check JohnHayCheck  # pays only for that check
+
+Set `BLK_HAY__CHECK_WORKERS` above 1 to spread the checks over that many worker processes, each with its own browser.
 """
 
-import logging, pprint, sys, traceback
+import argparse, datetime, logging, sys
 
 import settings
-from lib import page_checks
-from lib.page_checks import YokenCheck, JohnHayCheck, GregorianCheck, BrownCheck, MiscMicrofilmCheck, MiscHayJohnHayCheck
-from lib.results_checks import BeckwithResultsCheck, YokenResultsCheck, JohnHayResultsCheck, GregorianResultsCheck, BrownResultsCheck
+from lib import selection
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
-    datefmt='%d/%b/%Y %H:%M:%S' )
 log = logging.getLogger(__name__)
 
 
-def run_page_checks():
-    """ Manages functional-checks for bib-pages. """
-    try:
-        page_checks.check_A()         # `David Beckwith papers`
-        yoken = YokenCheck()          # `Mel B. Yoken collection`
-        yoken.run_check()
-        john_hay = JohnHayCheck()     # `John Hay papers`
-        john_hay.run_check()
-        gregorian = GregorianCheck()  # `Vartan Gregorian papers`
-        gregorian.run_check()
-        brown = BrownCheck()          # `John Nicholas Brown II papers`
-        brown.run_check()
-        microfilm = MiscMicrofilmCheck()
-        microfilm.run_check()
-        h_jh = MiscHayJohnHayCheck()
-        h_jh.run_check()
-    except Exception:
-        log.exception( 'exception; traceback...' )
-        # raise
+## the run-machinery -- and selenium, via lib/browser_pool.py -- is imported only once a run is certain,
+## so `--list` and `--dry-run` stay instant; selenium itself loads only when a selected check first borrows a browser
 
-def run_results_checks():
-    """ Manages functional-checks for bib-pages. """
+
+def run_all_checks( incremental=False, names=None ):
+    """ Manages functional-checks for bib-pages and search-results; returns per-check results. """
+    from lib import failures, history, runner, supervisor
+    from lib.browser_pool import BrowserPool
+    supervisor.reap_orphans()
+    started_at = datetime.datetime.now().isoformat()
+    pool = BrowserPool()
+    try:
+        results = runner.run_checks( list(runner.CHECKS) if names is None else names, pool, incremental=incremental )
+    finally:
+        pool.shutdown()
     try:
-        beckwith = BeckwithResultsCheck()    # `David Beckwith papers`
-        beckwith.run_check()
-        yoken = YokenResultsCheck()          # `Mel B. Yoken collection`
-        yoken.run_check()
-        john_hay = JohnHayResultsCheck()     # `John Hay papers`
-        john_hay.run_check()
-        gregorian = GregorianResultsCheck()  # `Vartan Gregorian papers`
-        gregorian.run_check()
-        brown = BrownResultsCheck()          # `John Nicholas Brown II papers`
-        brown.run_check()
+        history.record_run( results, started_at, mode='incremental' if incremental else 'run' )
     except Exception:
-        log.exception( 'exception; traceback...' )
-        # raise
+        log.exception( 'could not record run-history' )
+    failures.update( results )
+    log_summary( results )
+    return results
+
+def log_summary( results ):
+    """ Logs one line per check.
+        Called by run_all_checks() """
+    lines = []
+    for result in results:
+        outcome = 'passed' if result['passed'] else 'FAILED'
+        if result.get( 'skipped' ):
+            outcome = 'skipped (unchanged)'
+        lines.append( f'{result["check"]}: {outcome} ({result["seconds"]}s)' )
+    log.info( '\n-------\nResults...\n' + '\n'.join(lines) )
+    return
+
+
+def positive_int( value ):
+    number = int( value )
+    if number < 1:
+        raise argparse.ArgumentTypeError( f'`{value}` is not at least 1' )
+    return number
+
+
+def parse_args( argv=None ):
+    parser = argparse.ArgumentParser( description='Functional checks of Hay request-links in the Blacklight catalog.' )
+    choose = parser.add_argument_group( 'check selection; filters combine, and each takes alternatives' )
+    choose.add_argument( '--check', nargs='+', default=None, metavar='NAME', help='check-names' )
+    choose.add_argument( '--bib', nargs='+', default=None, help='bib-ids of page-checks, eg b2498067; results-checks have none, so never match' )
+    choose.add_argument( '--location', nargs='+', default=None, help='item locations, eg \'ANNEX HAY\' \'HAY MICROFLM\'' )
+    choose.add_argument( '--kind', nargs='+', default=None, choices=['page', 'results'] )
+    parser.add_argument( '--list', action='store_true', help='list the selected checks and exit' )
+    parser.add_argument( '--dry-run', action='store_true', help='show what would run, on which engine, and exit' )
+    parser.add_argument( '--incremental', action='store_true',
+        help='skip checks whose pages, and availability data, are unchanged since they last passed; needs `BLK_HAY__AVAILABILITY_URL_PATTERN`, else nothing is skipped' )
+    parser.add_argument( '--daemon', action='store_true', help='keep browsers warm and re-run the checks on an interval' )
+    parser.add_argument( '--rerun-failed', action='store_true',
+        help='re-run the selected checks that failed, to classify them flaky or consistent; exits 1 if any failed consistently' )
+    parser.add_argument( '--repetitions', type=positive_int, default=3, help='`--rerun-failed` runs per check, in parallel' )
+    parser.add_argument( '--shard-index', type=int, default=0 )
+    parser.add_argument( '--shard-count', type=int, default=1, help='above 1, runs only this node\'s shard and writes its result-file' )
+    parser.add_argument( '--shard-durations', default=None, help='shared expected-durations file, from `python3 -m lib.sharding durations`' )
+    parser.add_argument( '--results-file', default=None, help='default, `<BLK_HAY__RESULTS_DIR>/shard-<index>-of-<count>.json`' )
+    return parser.parse_args( argv )
+
+
+def main( argv=None ):
+    args = parse_args( argv )
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    if args.incremental and not settings.AVAILABILITY_URL_PATTERN:
+        log.warning( '`--incremental` without `BLK_HAY__AVAILABILITY_URL_PATTERN` set can\'t see availability changes, so every check will run' )
+    names = selection.select( args.check, args.bib, args.location, args.kind )
+    if args.shard_count > 1:
+        from lib import sharding
+        names = sharding.shard_names( names, args.shard_index, args.shard_count, args.shard_durations )
+    if args.list:
+        selection.list_checks( names )
+        return 0
+    if args.dry_run:
+        selection.dry_run( names )
+        return 0
+    if not names:
+        log.warning( 'no checks selected' )
+        if ( args.shard_count > 1 or args.results_file ) and not ( args.rerun_failed or args.daemon ):
+            from lib import sharding
+            sharding.write_results( [], args.shard_index, args.shard_count, datetime.datetime.now().isoformat(), args.results_file )  # merge expects every shard's file
+        return 0
+    if args.rerun_failed:
+        from lib import failures
+        verdicts = failures.rerun_failed( args.repetitions, names=names )
+        return 1 if any( verdict['verdict'] == 'consistent' for verdict in verdicts.values() ) else 0
+    if args.daemon:
+        from lib import daemon
+        daemon.run( names, incremental=args.incremental )
+        return 0
+    started_at = datetime.datetime.now().isoformat()
+    results = run_all_checks( incremental=args.incremental, names=names )
+    if args.shard_count > 1 or args.results_file:
+        from lib import sharding
+        sharding.write_results( results, args.shard_index, args.shard_count, started_at, args.results_file )
+    log.info( '\n-------\nAll checks complete' )
+    return 0 if all( result['passed'] for result in results ) else 1
 
 
-run_page_checks()
-run_results_checks()
-try:
-    browser.close()
-except:
-    pass
-log.info( '\n-------\nAll checks complete' )
+if __name__ == '__main__':
+    sys.exit( main() )
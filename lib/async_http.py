@@ -0,0 +1,33 @@
+"""
+asyncio front-end for the pooled `http_engine.HttpClient`.
+
+Requests run on a bounded thread-pool -- the pool-size is the concurrency-limit --
+and each thread keeps its own keep-alive connections, so a burst of requests re-uses a few warm sockets.
+"""
+
+import asyncio, functools, logging
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.http_engine import HttpClient
+
+
+log = logging.getLogger(__name__)
+
+
+class AsyncClient:
+
+    def __init__( self, concurrency=10, timeout=30 ):
+        self.concurrency = concurrency
+        self.client = HttpClient( timeout=timeout )
+        self.executor = ThreadPoolExecutor( max_workers=concurrency, thread_name_prefix='async_http' )
+
+    async def get( self, url, headers=None ):
+        """ Returns an http_engine.HttpResponse. """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor( self.executor, functools.partial(self.client.get, url, headers) )
+
+    def close( self ):
+        self.executor.shutdown( wait=True )
+        return
+
+    ## end class AsyncClient
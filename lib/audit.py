@@ -0,0 +1,237 @@
+"""
+Bulk Hay request-link audit -- the rules in `lib/request_rules.py`, applied to every item of every bib in a list.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  (env_bh_selenium) $ python3 -m lib.audit hay_bibs.txt --output audit.jsonl --concurrency 6
+  $ python3 -m lib.audit hay_bibs.txt --source availability --concurrency 20  # no browser: the data-source's reported links
+  $ python3 -m lib.audit hay_bibs.txt --output audit.jsonl --resume  # after an interruption, skips bibs already audited; retries the rest
+
+The bib-file holds one bib-id per line; blank lines and `#` comments are ignored.
+
+`--source page` (the default) audits what patrons see: each bib's `?limit=false` page is loaded in one of `--concurrency` pooled browsers,
+awaited until its availability cells are filled in (lib/readiness.py), and read in a single extraction (lib/extraction.py);
+the shown link is whichever request-link cell reads `request-access`.
+`--source availability` audits the availability data-source's reported link (`BLK_HAY__AVAILABILITY_LINK_FIELD`, required) instead, over async http -- much faster, but not the rendered page.
+
+Verdicts stream to `--output`, one json line per Hay item as each bib finishes...
+    { bib, item_id, index, location, callnumber, status, expected, actual, verdict: ok | mismatch | not-reported }
+...or one line per bib that couldn't be read: { bib, verdict: error, error }. Items at non-Hay locations are counted, not written.
+A bib's item-lines are followed by its completion-record, { bib, done: true, items: hay-item-count } -- written even for a bib with no Hay items.
+With `--resume`, only bibs with a completion-record are skipped; errored and cut-short bibs are audited again,
+so a bib's later lines supersede its earlier ones. A partial last line, from a write the interruption cut short, is dropped first.
+"""
+
+import argparse, asyncio, datetime, json, logging, os, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import settings
+from lib import check_engine, extraction, readiness, request_rules
+from lib.availability_checker import NOT_REPORTED, availability_url, normalize_items, require_link_field, require_pattern
+
+
+log = logging.getLogger(__name__)
+
+
+AUDIT_FIELDS = [ 'location', 'callnumber', 'status' ] + check_engine.LINK_CLASSES
+
+
+def read_bibs( path ):
+    bibs = []
+    with open( path, 'r' ) as f:
+        for line in f:
+            bib = line.split( '#', 1 )[0].strip()
+            if bib:
+                bibs.append( bib )
+    return list( dict.fromkeys(bibs) )
+
+
+def done_bibs( output ):
+    """ Returns the bibs an earlier output-file has completion-records for, for `--resume`;
+        bibs with only an error-line, or item-lines an interruption cut short of their completion-record, aren't done.
+        Called by run() """
+    if not os.path.exists( output ):
+        return set()
+    ( done, seen ) = ( set(), set() )
+    with open( output, 'r' ) as f:
+        for line in f:
+            try:
+                record = json.loads( line )
+            except ValueError:
+                continue  # the partial last line of an interrupted write
+            seen.add( record['bib'] )
+            if record.get( 'done' ):
+                done.add( record['bib'] )
+    log.info( f'`{len(seen - done)}` errored or incomplete bib(s) will be retried' )
+    return done
+
+
+def drop_partial_line( output ):
+    """ Truncates the output-file after its last complete line, so appended verdicts don't run on from a cut-short write.
+        Called by run() """
+    if not os.path.exists( output ):
+        return
+    with open( output, 'rb+' ) as f:
+        data = f.read()
+        if data and not data.endswith( b'\n' ):
+            f.truncate( data.rfind(b'\n') + 1 )
+            log.warning( f'dropped a partial last line from ```{output}```' )
+    return
+
+
+def verdict_lines( bib, items ):
+    """ Applies the rules to a bib's items -- dicts of id, index, location, callnumber, status, link; returns ( verdict-dicts, out-of-scope count ).
+        Called by the audit sources. """
+    lines = []
+    for item in items:
+        if not request_rules.is_hay_location( item['location'] ):
+            continue
+        expected = request_rules.expected_link( item['location'], item['status'], item['callnumber'] )
+        verdict = 'not-reported' if item['link'] == NOT_REPORTED else ( 'ok' if item['link'] == expected else 'mismatch' )
+        lines.append( {
+            'bib': bib, 'item_id': item['id'], 'index': item['index'], 'location': item['location'], 'callnumber': item['callnumber'],
+            'status': item['status'], 'expected': expected, 'actual': item['link'], 'verdict': verdict } )
+    return ( lines, len(items) - len(lines) )
+
+
+## page source -------------------------------------------------------
+
+
+def shown_link( item ):
+    """ Returns the request-link class whose cell reads `request-access`; None if none does; every such class if several do. """
+    shown = [ class_name for class_name in check_engine.LINK_CLASSES if 'request-access' in ( item['fields'].get(class_name) or '' ) ]
+    return shown[0] if len( shown ) == 1 else ( shown or None )
+
+
+def audit_page( pool, bib ):
+    """ Loads, awaits and extracts one bib-page on a pooled browser; returns its items.
+        Called by run_pages(), on a worker thread. """
+    url = f'{settings.ROOT_PAGE_URL}/{bib}?limit=false'
+    with pool.borrow() as browser:
+        browser.get( url )
+        readiness.wait_until_ready( browser, {'kind': 'page'} )  # no item targets: every row's status
+        snapshot = extraction.extract_page( browser, AUDIT_FIELDS )
+    return [ {
+        'id': item['id'], 'index': item['index'], 'location': item['fields']['location'], 'callnumber': item['fields']['callnumber'],
+        'status': item['fields']['status'], 'link': shown_link(item) } for item in snapshot['items'] ]
+
+
+def run_pages( bibs, concurrency, emit ):
+    """ Audits rendered pages over `concurrency` browsers, keeping at most twice that many bibs in flight.
+        Called by run() """
+    from lib.browser_pool import BrowserPool
+    pool = BrowserPool( size=concurrency )
+    pending = {}
+    remaining = iter( bibs )
+    try:
+        with ThreadPoolExecutor( max_workers=concurrency, thread_name_prefix='audit' ) as executor:
+            while True:
+                for bib in remaining:
+                    pending[ executor.submit(audit_page, pool, bib) ] = bib
+                    if len( pending ) >= concurrency * 2:
+                        break
+                if not pending:
+                    break
+                ( finished, _ ) = wait( pending, return_when=FIRST_COMPLETED )
+                for future in finished:
+                    bib = pending.pop( future )
+                    try:
+                        emit( bib, future.result(), None )
+                    except Exception as e:
+                        emit( bib, None, repr(e) )
+    finally:
+        pool.shutdown()
+    return
+
+
+## availability source -----------------------------------------------
+
+
+async def run_availability( bibs, concurrency, emit ):
+    """ Audits the availability data-source over async http, at most `concurrency` requests in flight.
+        Called by run() """
+    from lib.async_http import AsyncClient
+    client = AsyncClient( concurrency )
+    semaphore = asyncio.Semaphore( concurrency * 2 )
+
+    async def audit( bib ):
+        async with semaphore:
+            try:
+                response = await client.get( availability_url(bib), {'Accept': 'application/json'} )
+                assert response.status == 200, f'http `{response.status}`'
+                items = normalize_items( json.loads(response.text) )
+                emit( bib, [dict(item, index=index) for ( index, item ) in enumerate(items)], None )
+            except Exception as e:
+                emit( bib, None, repr(e) )
+
+    try:
+        await asyncio.gather( *[audit(bib) for bib in bibs] )
+    finally:
+        client.close()
+    return
+
+
+## driver ------------------------------------------------------------
+
+
+def run( bib_path, output, source='page', concurrency=None, resume=False ):
+    """ Audits every bib in the file, streaming verdicts to `output`; returns the tallies. """
+    if source == 'availability':
+        require_pattern()
+        require_link_field()  # without it, every verdict would be `not-reported`
+    bibs = read_bibs( bib_path )
+    if resume:
+        drop_partial_line( output )
+        done = done_bibs( output )
+        bibs = [ bib for bib in bibs if bib not in done ]
+        log.info( f'resuming; `{len(done)}` bib(s) already audited' )
+    concurrency = concurrency or ( settings.BROWSER_POOL_SIZE if source == 'page' else settings.AVAILABILITY_CONCURRENCY )
+    tallies = { 'bibs': 0, 'errors': 0, 'ok': 0, 'mismatch': 0, 'not-reported': 0, 'out_of_scope_items': 0 }
+    start = time.monotonic()
+    log.info( f'auditing `{len(bibs)}` bib(s) from the `{source}` source, concurrency `{concurrency}`' )
+    with open( output, 'a' if resume else 'w' ) as f:
+
+        def emit( bib, items, error ):
+            """ Writes one bib's verdicts and completion-record, or its error, and flushes -- so an interrupted audit loses nothing already done. """
+            tallies['bibs'] += 1
+            if error:
+                tallies['errors'] += 1
+                lines = [ {'bib': bib, 'verdict': 'error', 'error': error} ]
+            else:
+                ( lines, out_of_scope ) = verdict_lines( bib, items )
+                tallies['out_of_scope_items'] += out_of_scope
+                for line in lines:
+                    tallies[line['verdict']] += 1
+                lines.append( {'bib': bib, 'done': True, 'items': len(lines)} )
+            f.write( ''.join(json.dumps(line) + '\n' for line in lines) )
+            f.flush()
+            if tallies['bibs'] % 100 == 0:
+                log.info( f'`{tallies["bibs"]}` of `{len(bibs)}` bibs audited; ```{tallies}```' )
+
+        if source == 'page':
+            run_pages( bibs, concurrency, emit )
+        else:
+            asyncio.run( run_availability(bibs, concurrency, emit) )
+    tallies['seconds'] = round( time.monotonic() - start, 1 )
+    log.info( f'audit complete at `{datetime.datetime.now().isoformat()}`; ```{tallies}```; verdicts in ```{output}```' )
+    return tallies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser( description='Bulk audit of Hay request-links against the rules.' )
+    parser.add_argument( 'bib_file', help='one bib-id per line' )
+    parser.add_argument( '--output', default='audit.jsonl' )
+    parser.add_argument( '--source', choices=['page', 'availability'], default='page' )
+    parser.add_argument( '--concurrency', type=int, default=None,
+        help='browsers (page) or requests (availability) at once; default `BLK_HAY__BROWSER_POOL_SIZE` / `BLK_HAY__AVAILABILITY_CONCURRENCY`' )
+    parser.add_argument( '--resume', action='store_true', help='append to `--output`, skipping bibs completed in it; errored and cut-short bibs are retried' )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    args = parse_args()
+    run( args.bib_file, args.output, args.source, args.concurrency, args.resume )
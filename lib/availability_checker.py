@@ -0,0 +1,156 @@
+"""
+Asyncio availability checker -- validates the availability rules without rendering any page.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ python3 -m lib.availability_checker
+
+Calls the catalog's availability data-source (`BLK_HAY__AVAILABILITY_URL_PATTERN` -- required, there's no default) directly,
+for every bib in `lib/page_checks.py` at once, over one pooled client with a concurrency limit. Then, per item...
+- spec'd items: location, callnumber and status must match the spec, and the link the rules call for, given the fetched data, must be the spec's link
+- every item: the request-link the data-source reports, if it reports one, must be the link the rules call for
+
+The payload shape is ASSUMED: it's the shape `lib/stand_in_server.py` serves, not yet confirmed against the real catalog's endpoint.
+`normalize_items()` is the one place it's read...
+    { 'items': [ { 'id': 'item_...', 'location': '...', 'callnumber': '...', 'status': '...',
+                   '<link-field>': { 'class': 'hay_aeon_url', 'url': '...' } or null }, ... ] }
+Reported links are read only once `BLK_HAY__AVAILABILITY_LINK_FIELD` names the link-field -- there's no default, so until the real
+field is confirmed every link counts as not reported, and only the rules-versus-spec comparison runs.
+"""
+
+import asyncio, json, logging, time
+
+import settings
+from lib import page_checks, request_rules
+from lib.async_http import AsyncClient
+
+
+log = logging.getLogger(__name__)
+
+
+NOT_REPORTED = 'not-reported'  # the data-source payload carries no request-link info for the item
+
+
+class AvailabilityNotConfigured( Exception ):
+    """ Raised when `BLK_HAY__AVAILABILITY_URL_PATTERN` isn't set -- or `BLK_HAY__AVAILABILITY_LINK_FIELD`, where reported links are needed. """
+    pass
+
+
+def require_pattern():
+    """ Raises unless the availability url-pattern is configured; the endpoint is never guessed. """
+    if not settings.AVAILABILITY_URL_PATTERN:
+        raise AvailabilityNotConfigured( 'set `BLK_HAY__AVAILABILITY_URL_PATTERN`, eg ```https://<host>/<path>/{bib}.json```' )
+    return settings.AVAILABILITY_URL_PATTERN
+
+
+def availability_url( bib ):
+    return require_pattern().format( bib=bib )
+
+
+def require_link_field():
+    """ Raises unless the payload's request-link field is configured; for uses that need reported links. """
+    if not settings.AVAILABILITY_LINK_FIELD:
+        raise AvailabilityNotConfigured( 'set `BLK_HAY__AVAILABILITY_LINK_FIELD` to the availability payload\'s request-link field' )
+    return settings.AVAILABILITY_LINK_FIELD
+
+
+def normalize_items( payload ):
+    """ Returns the payload's items as dicts of id, location, callnumber, status, link -- from the assumed shape above;
+        link is NOT_REPORTED when the item lacks the link-field, or the link-field isn't configured.
+        Called by check_bib() """
+    link_field = settings.AVAILABILITY_LINK_FIELD
+    items = []
+    for raw in payload.get( 'items', [] ):
+        link = NOT_REPORTED
+        if link_field and link_field in raw:
+            link = ( raw[link_field] or {} ).get( 'class' )
+        items.append( {
+            'id': raw.get( 'id' ),
+            'location': raw.get( 'location' ),
+            'callnumber': raw.get( 'callnumber' ),
+            'status': raw.get( 'status' ),
+            'link': link } )
+    return items
+
+
+def find_item( items, item_spec ):
+    if item_spec.get( 'item_id' ):
+        return next( (item for item in items if item['id'] == item_spec['item_id']), None )
+    index = item_spec.get( 'index' )
+    return items[index] if index is not None and index < len( items ) else None
+
+
+def check_items( spec, items ):
+    """ Applies the spec and the request-link rules to a bib's availability items; returns a list of problem-strings.
+        Called by check_bib() """
+    problems = []
+    for item_spec in spec['items']:
+        label = item_spec.get( 'item_id' ) or f'index {item_spec.get("index")}'
+        item = find_item( items, item_spec )
+        if item is None:
+            problems.append( f'{label}: not in availability data' )
+            continue
+        for field in ( 'location', 'callnumber', 'status' ):
+            if field in item_spec and item[field] != item_spec[field]:
+                problems.append( f'{label}: {field} is `{item[field]}`, expected `{item_spec[field]}`' )
+        if 'link' in item_spec:
+            ruled = request_rules.expected_link( item['location'], item['status'], item['callnumber'] )
+            if ruled != item_spec['link']:
+                problems.append( f'{label}: rules call for link `{ruled}` on the fetched data, spec expects `{item_spec["link"]}`' )
+    for item in items:
+        if item['link'] == NOT_REPORTED:
+            continue
+        ruled = request_rules.expected_link( item['location'], item['status'], item['callnumber'] )
+        if item['link'] != ruled:
+            problems.append( f'{item["id"]}: data-source reports link `{item["link"]}`, rules call for `{ruled}`' )
+    return problems
+
+
+async def check_bib( client, spec ):
+    """ Fetches one bib's availability data and checks it; returns a result-dict.
+        Called by check_all() """
+    url = availability_url( spec['bib'] )
+    result = { 'check': spec['name'], 'bib': spec['bib'], 'passed': False, 'problems': [], 'items': 0, 'seconds': None, 'error': None }
+    start = time.monotonic()
+    try:
+        response = await client.get( url, headers={'Accept': 'application/json'} )
+        assert response.status == 200, f'http `{response.status}` for url, ```{url}```'
+        items = normalize_items( json.loads(response.text) )
+        result['items'] = len( items )
+        result['problems'] = check_items( spec, items )
+        result['passed'] = not result['problems']
+    except Exception as e:
+        result['error'] = repr( e )
+    result['seconds'] = round( time.monotonic() - start, 3 )
+    return result
+
+
+async def check_all( specs, concurrency ):
+    client = AsyncClient( concurrency )
+    try:
+        return await asyncio.gather( *[check_bib(client, spec) for spec in specs] )
+    finally:
+        client.close()
+
+
+def run( specs=None, concurrency=None ):
+    """ Checks every bib-spec's availability data in one concurrent burst; returns result-dicts in spec order. """
+    require_pattern()
+    if not settings.AVAILABILITY_LINK_FIELD:
+        log.warning( '`BLK_HAY__AVAILABILITY_LINK_FIELD` not set; the data-source\'s reported links aren\'t checked' )
+    specs = specs if specs is not None else page_checks.SPECS
+    start = time.monotonic()
+    results = asyncio.run( check_all(specs, concurrency or settings.AVAILABILITY_CONCURRENCY) )
+    for result in results:
+        outcome = 'passed' if result['passed'] else 'FAILED'
+        log.info( f'{result["check"]} ({result["bib"]}): {outcome}; `{result["items"]}` items; ```{result["problems"] or result["error"] or ""}```' )
+    log.info( f'availability-checked `{len(results)}` bibs in `{round(time.monotonic() - start, 3)}` seconds' )
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    run()
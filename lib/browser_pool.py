@@ -0,0 +1,209 @@
+import atexit, contextlib, json, logging, threading, urllib.parse
+
+import settings
+from lib.supervisor import BrowserRecord
+## selenium is imported where first needed, so runs that never launch a browser -- http-engine or replay checks, listing -- don't load it
+
+
+log = logging.getLogger(__name__)
+
+
+LEAN_PREFERENCES = {  # `BLK_HAY__LEAN_BROWSER` profile-preferences; none of this affects item-text or link-hrefs
+    'permissions.default.image': 2,  # no images
+    'gfx.downloadable_fonts.enabled': False,  # no web-fonts
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default': 5,  # no media
+    'network.prefetch-next': False,
+    'network.dns.disablePrefetch': True,
+    'network.http.speculative-parallel-limit': 0,
+    'browser.cache.disk.enable': False,  # memory-cache only
+    }
+
+BLACKHOLE_PROXY = 'PROXY 127.0.0.1:9'  # the discard port; denied requests fail immediately
+
+PAC_TEMPLATE = """function FindProxyForURL( url, host ) {
+  var allowHosts = %(allow_hosts)s;
+  var denyPatterns = %(deny_patterns)s;
+  for ( var i = 0; i < denyPatterns.length; i++ ) {
+    if ( shExpMatch(url, denyPatterns[i]) ) { return '%(blackhole)s'; }
+  }
+  if ( allowHosts.length && allowHosts.indexOf(host) === -1 ) { return '%(blackhole)s'; }
+  return 'DIRECT';
+}"""
+
+
+def pac_url( allow_hosts, deny_patterns ):
+    """ Returns a `data:` proxy-auto-config url that sends denied urls -- and, if `allow_hosts` is given, every other host -- to a black-hole.
+        Firefox hands a PAC script only the scheme and host of an https url, so path-patterns only match plain-http urls.
+        Called by build_options() """
+    script = PAC_TEMPLATE % {
+        'allow_hosts': json.dumps( list(allow_hosts) ), 'deny_patterns': json.dumps( list(deny_patterns) ), 'blackhole': BLACKHOLE_PROXY }
+    return 'data:application/x-ns-proxy-autoconfig,' + urllib.parse.quote( script )
+
+
+def build_options( lean=None ):
+    """ Returns headless Firefox options; with `lean` (default `BLK_HAY__LEAN_BROWSER`), blocks images, fonts and denied urls --
+        and, given an allow-list (`BLK_HAY__LEAN_ALLOW_HOSTS`, defaulted only once the availability host is configured), every other host.
+        Called by launch_browser() """
+    from selenium.webdriver.firefox.options import Options
+    lean = settings.LEAN_BROWSER if lean is None else lean
+    opts = Options()
+    opts.set_headless()
+    assert opts.headless  # Operating in headless mode
+    if lean:
+        preferences = dict( LEAN_PREFERENCES )
+        if settings.LEAN_BLOCK_STYLESHEETS:
+            preferences['permissions.default.stylesheet'] = 2
+        if settings.LEAN_ALLOW_HOSTS or settings.LEAN_DENY_PATTERNS:
+            preferences['network.proxy.type'] = 2  # auto-config url
+            preferences['network.proxy.autoconfig_url'] = pac_url( settings.LEAN_ALLOW_HOSTS, settings.LEAN_DENY_PATTERNS )
+        for ( name, value ) in preferences.items():
+            opts.set_preference( name, value )
+    return opts
+
+
+RESET_STORAGE_JS = 'window.localStorage.clear(); window.sessionStorage.clear();'
+
+
+def launch_browser( lean=None ):
+    """ Starts a headless Firefox.
+        Called by BrowserPool.acquire() """
+    from selenium.webdriver import Firefox
+    browser = Firefox(options=build_options(lean))
+    try:
+        browser.set_script_timeout( settings.BROWSER_WAIT_SECONDS + 5 )  # readiness is waited-on explicitly; see lib/readiness.py
+    except Exception:
+        browser.quit()
+        raise
+    log.info( f'browser launched{" (lean)" if (settings.LEAN_BROWSER if lean is None else lean) else ""}' )
+    return browser
+
+
+class BrowserPool:
+    """ Bounded set of headless browsers that checks borrow and return,
+        so a run pays for one or a few browser launches instead of one per check.
+        Owns every browser it launches: samples each one's memory and cpu, recycles it past the page/memory limits (see lib/supervisor.py),
+        and quits whatever is left at shutdown -- or at interpreter exit, if shutdown was never reached. """
+
+    def __init__( self, size=None, lean=None ):
+        self.size = size or settings.BROWSER_POOL_SIZE
+        self.lean = lean  # None means `BLK_HAY__LEAN_BROWSER`
+        self.idle = []  # most-recently-returned last, and handed out first
+        self.launched = []
+        self.launching = 0  # slots held by launches in progress
+        self.records = {}  # id(browser) -> supervisor.BrowserRecord
+        self.retired = []  # summaries of recycled/discarded browsers
+        self.lock = threading.Lock()
+        self.available = threading.Condition( self.lock )  # notified whenever a browser is returned or a slot is freed
+        self.closed = False
+        atexit.register( self.shutdown )
+
+    @contextlib.contextmanager
+    def borrow( self ):
+        """ Yields a browser and hands it back to the pool afterwards, even if the check raised.
+            Called by checker.py """
+        browser = self.acquire()
+        try:
+            yield browser
+        finally:
+            self.release( browser )
+
+    def acquire( self ):
+        """ Returns an idle browser, launching one if the pool has a free slot -- including one freed by a recycled or discarded browser;
+            otherwise waits until a browser is returned or a slot is freed.
+            Called by borrow() """
+        with self.available:
+            while True:
+                if self.closed:
+                    raise RuntimeError( 'browser pool is shut down' )
+                if self.idle:
+                    return self.idle.pop()
+                if len( self.launched ) + self.launching < self.size:
+                    self.launching += 1
+                    break
+                self.available.wait()
+        try:
+            browser = launch_browser( self.lean )  # outside the lock, so returns aren't held up by a slow launch
+        except Exception:
+            with self.available:
+                self.launching -= 1
+                self.available.notify()
+            raise
+        with self.available:
+            self.launching -= 1
+            self.launched.append( browser )
+            self.records[id(browser)] = BrowserRecord( browser )
+        return browser
+
+    def release( self, browser ):
+        """ Resets browser-state and puts the browser back; a browser that can't be reset, or is due for recycling, is discarded.
+            Called by borrow() """
+        from selenium.common.exceptions import WebDriverException
+        if self.closed:
+            self.discard( browser )
+            return
+        record = self.records.get( id(browser) )
+        if record:
+            record.sample()
+            reason = record.recycle_reason()
+            if reason:
+                log.info( f'recycling browser; {reason}' )
+                self.discard( browser )
+                return
+        try:
+            self.reset( browser )
+        except WebDriverException:
+            log.exception( 'browser reset failed; discarding browser' )
+            self.discard( browser )
+            return
+        with self.available:
+            self.idle.append( browser )
+            self.available.notify()
+        return
+
+    def reset( self, browser ):
+        """ Clears cookies and web-storage so the next borrower starts clean.
+            Called by release() """
+        from selenium.common.exceptions import WebDriverException
+        browser.delete_all_cookies()
+        try:
+            browser.execute_script( RESET_STORAGE_JS )
+        except WebDriverException:
+            log.debug( 'no web-storage to clear on current page' )
+        browser.get( 'about:blank' )
+        return
+
+    def discard( self, browser ):
+        """ Quits a browser and frees its slot, waking a borrower waiting for one -- who launches the replacement.
+            Called by release() and shutdown() """
+        with self.available:
+            if browser in self.launched:
+                self.launched.remove( browser )
+            if browser in self.idle:
+                self.idle.remove( browser )
+            record = self.records.pop( id(browser), None )
+            if record:
+                self.retired.append( record.summary() )
+            self.available.notify()
+        try:
+            browser.quit()  # `close()` would leave geckodriver running
+        except Exception:
+            log.exception( 'problem quitting browser' )
+        return
+
+    def shutdown( self ):
+        """ Quits every browser the pool launched; safe to call more than once.
+            Called by checker.py, and at interpreter exit """
+        with self.available:
+            already_closed = self.closed
+            self.closed = True
+            browsers = list( self.launched )
+            self.available.notify_all()  # waiting borrowers raise, rather than wait forever
+        for browser in browsers:
+            self.discard( browser )
+        if not already_closed:
+            atexit.unregister( self.shutdown )
+            log.info( f'browser pool shut down; `{len(browsers)}` browser(s) quit; usage, ```{self.retired}```' )
+        return
+
+    ## end class BrowserPool
@@ -0,0 +1,277 @@
+"""
+Runs the declarative check-specs in `lib/page_checks.py` and `lib/results_checks.py`.
+
+Every spec goes through the same flow (its `warm_bibs` are warmed once per run, beforehand, by lib/warmup.py):
+- load the page, and wait until the availability-populated cells it targets are filled in
+- extract everything the spec's assertions need, in one planned round-trip, into a plain-python snapshot
+- assert against the snapshot
+- hold the page's Navigation/Resource Timing, read during extraction, to the spec's `budgets`, if any
+
+With `BLK_HAY__CHECK_ENGINE=auto`, a spec is split by field (see `split_spec()`): its server-rendered assertions -- format, locations,
+callnumbers -- run on lib/http_engine.py, and only its javascript-filled `status` and request-link assertions on a browser.
+"""
+
+import logging
+
+import settings
+from lib import extraction, readiness, snapshots
+from lib.results_crawler import ResultsCrawler
+from lib.results_index import check_format
+from lib.timing import PhaseTimer
+
+
+log = logging.getLogger(__name__)
+
+
+EXPECTED_FORMAT = 'Archives/Manuscripts'
+ITEM_FIELDS = [ 'location', 'callnumber', 'status' ]
+LINK_CLASSES = [ 'scan', 'jcb_url', 'hay_aeon_url', 'ezb_volume_url', 'annexhay_easyrequest_url' ]
+TIMING_METRICS = [ 'ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'availability_observed_ms', 'availability_fetch_ms' ]
+AVAILABILITY_FIELDS = [ 'status', 'link', 'request_access', 'href' ]  # spec-item keys asserted on javascript-filled cells
+
+
+class PerformanceBudgetExceeded( AssertionError ):
+    """ Raised when a page's timing is over one of its spec's `budgets`. """
+
+
+def check_budgets( timing, budgets ):
+    """ Raises PerformanceBudgetExceeded listing every metric over budget; a metric not measured is reported, not failed.
+        Called by BaseCheck.run_check() """
+    if not budgets:
+        return
+    assert all( metric in TIMING_METRICS for metric in budgets ), f'unknown budget metric(s), ```{sorted(budgets)}```'
+    if not timing:
+        log.warning( 'no page-timing available (non-browser driver); budgets not checked' )
+        return
+    over = []
+    for ( metric, limit ) in budgets.items():
+        if timing.get( metric ) is None:
+            log.warning( f'`{metric}` not measured; budget of `{limit}` not checked' )
+        elif timing[metric] > limit:
+            over.append( f'{metric} {timing[metric]} > {limit}' )
+    if over:
+        raise PerformanceBudgetExceeded( f'over budget, ```{"; ".join(over)}```' )
+    return
+
+
+def warm_urls( spec ):
+    """ Returns the production urls whose loading warms the availability cache for the spec's bibs.
+        Called by lib/warmup.py """
+    return [ f'{settings.PRODUCTION_ROOT_PAGE_URL}/{bib}?limit=false' for bib in spec.get('warm_bibs', []) ]
+
+
+def needs_browser( spec ):
+    """ Returns True if the spec asserts on availability-populated fields (`status`, request-links), which need javascript.
+        Called by split_spec() and ResultsCheck.ready_targets() """
+    return any( field in item for item in spec['items'] for field in AVAILABILITY_FIELDS )
+
+
+def split_spec( spec ):
+    """ Returns ( server-part, availability-part ) of a spec: the first keeps the format, location and callnumber assertions, for the http engine;
+        the second only the `status` and request-link ones, for a browser -- None if there are none.
+        Items keep what finds them: `item_id`/`index` on bib-pages; `callnumber` on search-results.
+        Called by check_parts() """
+    keys = [ 'item_id', 'index', 'callnumber' ] if 'bib' in spec else [ 'callnumber' ]
+    server = dict( spec, items=[ {key: value for ( key, value ) in item.items() if key not in AVAILABILITY_FIELDS} for item in spec['items'] ] )
+    server.pop( 'budgets', None )  # page-timing is only read on a browser
+    availability = dict( spec, check_format=False, items=[
+        {key: value for ( key, value ) in item.items() if key in keys or key in AVAILABILITY_FIELDS}
+        for item in spec['items'] if any( field in item for field in AVAILABILITY_FIELDS ) ] )
+    return ( server, availability if needs_browser( spec ) else None )
+
+
+def check_parts( spec ):
+    """ Returns the ( spec-part, engine ) pairs a check runs as, in order: the whole spec on the replay driver or a browser;
+        or, with the `auto` engine, its server-rendered part over http, then -- only if it asserts on any -- its availability part on a browser.
+        Called by lib/runner.py and lib/selection.py """
+    if settings.SNAPSHOT_MODE == 'replay':
+        return [ (spec, 'replay') ]
+    if settings.CHECK_ENGINE != 'auto':
+        return [ (spec, 'browser') ]
+    ( server, availability ) = split_spec( spec )
+    return [ (server, 'http') ] + ( [(availability, 'browser')] if availability else [] )
+
+
+def check_url( spec ):
+    """ Returns the page-url the spec's check loads.
+        Called by lib/fingerprints.py """
+    return make_check( spec, None ).url()
+
+
+def make_check( spec, driver ):
+    """ Returns the check-runner for the spec's kind.
+        Called by lib/runner.py """
+    check_class = ResultsCheck if 'query' in spec else PageCheck
+    return check_class( spec, driver )
+
+
+class BaseCheck:
+
+    def __init__( self, spec, driver ):
+        self.spec = spec
+        self.browser = driver
+        self.timer = PhaseTimer()
+        self.page_timing = None  # the page's Navigation/Resource Timing; set by extract()
+
+    def run_check( self ):
+        """ Loads, extracts, asserts -- functionally, then against any performance budgets; each phase timed. """
+        self.load_page()
+        with self.timer.phase( 'extract' ):
+            snapshot = self.extract()
+        log.info( f'page timing, ```{self.page_timing}```' )
+        with self.timer.phase( 'assert' ):
+            self.assert_snapshot( snapshot )
+            check_budgets( self.page_timing, self.spec.get('budgets') )
+        log.info( f'Result: test passed.' )  # won't get here unless all asserts pass
+        return
+
+    def load_page( self ):
+        """ Hits url; waits for the targeted rows' availability data.
+            Called by run_check() """
+        log.info( f'\n\n-------\nGoal: {self.spec["aim"].strip()}\n-------' )
+        url = self.url()
+        log.info( f'hitting url, ```{url}```' )
+        with self.timer.phase( 'navigation' ):
+            self.browser.get( url )
+        targets = self.ready_targets()
+        if targets:
+            with self.timer.phase( 'readiness' ):
+                readiness.wait_until_ready( self.browser, targets )
+        if settings.SNAPSHOT_MODE == 'record':
+            snapshots.record( url, self.browser )
+        return
+
+    ## end class BaseCheck
+
+
+class PageCheck( BaseCheck ):
+    """ Checks the format and the listed items of one bib-page. """
+
+    def url( self ):
+        url = f'{settings.ROOT_PAGE_URL}/{self.spec["bib"]}'
+        if self.spec.get( 'all_items' ):
+            url = f'{url}?limit=false'
+        return url
+
+    def ready_targets( self ):
+        """ Returns the rows whose availability data the spec asserts on, or None if it asserts on none.
+            Called by load_page() """
+        items = [ item for item in self.spec['items'] if ('status' in item or 'link' in item) ]
+        if not items:
+            return None
+        return {
+            'kind': 'page',
+            'item_ids': [ item['item_id'] for item in items if item.get('item_id') ],
+            'indexes': [ item['index'] for item in items if not item.get('item_id') ] }
+
+    def plan( self ):
+        """ Collects every field-class the spec's items assert on, so a single extraction reads them all.
+            Called by extract() """
+        class_names = []
+        for item in self.spec['items']:
+            wanted = [ field for field in ITEM_FIELDS if field in item ] + ( LINK_CLASSES if 'link' in item else [] )
+            class_names += [ class_name for class_name in wanted if class_name not in class_names ]
+        return class_names
+
+    def extract( self ):
+        """ Reads the format and the planned fields of every `bib_item` row, and the page-timing, in one round-trip.
+            Called by run_check() """
+        snapshot = extraction.extract_page( self.browser, self.plan() )
+        self.page_timing = snapshot.get( 'timing' )
+        return snapshot
+
+    def assert_snapshot( self, snapshot ):
+        """ Asserts the spec against extracted data.
+            Called by run_check() """
+        if self.spec.get( 'check_format', True ):
+            formats = snapshot['formats']
+            format_text = formats[1] if len( formats ) > 1 else None  # [0] is the word 'Format'
+            assert format_text == EXPECTED_FORMAT, f'format_element.text, ```{format_text}```'
+        for item_spec in self.spec['items']:
+            item = find_snapshot_item( snapshot, item_spec )
+            log.info( f'item.text, ```{item["text"]}```' )
+            fields = item['fields']
+            for field in ITEM_FIELDS:
+                if field in item_spec:
+                    assert fields[field] == item_spec[field], f'{field}.text, ```{fields[field]}```'
+            if 'link' in item_spec:
+                for class_type in LINK_CLASSES:
+                    if class_type == item_spec['link']:
+                        assert ( fields[class_type] or '' ).strip() == 'request-access', f'request_link.text, ```{fields[class_type]}```'
+                    else:
+                        assert fields[class_type] == '', f'{class_type} text, ```{fields[class_type]}```'
+        return
+
+    ## end class PageCheck
+
+
+def find_snapshot_item( snapshot, item_spec ):
+    """ Returns the snapshot-item matching the spec-item's `item_id` or `index`.
+        Called by PageCheck.assert_snapshot() """
+    for item in snapshot['items']:
+        if item_spec.get( 'item_id' ):
+            if item['id'] == item_spec['item_id']:
+                return item
+        elif item['index'] == item_spec['index']:
+            return item
+    raise AssertionError( f'item not found, ```{item_spec.get("item_id", item_spec.get("index"))}```' )
+
+
+class ResultsCheck( BaseCheck ):
+    """ Checks target rows, found by callnumber, on search-results -- crawling past the first page only while a target is unseen. """
+
+    def url( self ):
+        url = f'{settings.ROOT_PAGE_URL}?{self.spec["query"]}'
+        per_page = self.spec.get( 'per_page', settings.RESULTS_PER_PAGE )
+        if per_page:
+            url = f'{url}&per_page={per_page}'
+        return url
+
+    def max_pages( self ):
+        if self.spec.get( 'first_bib_only' ):
+            return 1  # only the very first result counts
+        return self.spec.get( 'max_pages', settings.RESULTS_MAX_PAGES )
+
+    def ready_targets( self ):
+        if not needs_browser( self.spec ):
+            return None  # nothing javascript-filled to wait for
+        return {
+            'kind': 'results', 'callnumbers': [ item['callnumber'] for item in self.spec['items'] ],
+            'partial': self.max_pages() > 1 }  # targets not on this page may be on a later one
+
+    def extract( self ):
+        """ Crawls result-pages, one round-trip each, until every target callnumber is seen; returns the crawled rows' index.
+            Called by run_check() """
+        crawler = ResultsCrawler(
+            self.browser, self.url(), [ item['callnumber'] for item in self.spec['items'] ], self.max_pages(), self.timer )
+        for row in crawler.rows():
+            pass
+        self.page_timing = crawler.first_timing
+        log.info( f'read `{crawler.pages_read}` results-page(s); unseen targets, ```{crawler.remaining}```' )
+        return crawler.index
+
+    def assert_snapshot( self, index ):
+        """ Asserts the spec against the indexed rows.
+            Called by run_check() """
+        for item_spec in self.spec['items']:
+            target_callnumber = item_spec['callnumber']
+            row = index.find( target_callnumber, first_bib_only=self.spec.get('first_bib_only', False) )
+            assert row, f'no row found for callnumber, ```{target_callnumber}```'
+            log.info( f'target_row.text, ```{row["text"]}```' )
+            if self.spec.get( 'check_format', True ):
+                check_format( row, EXPECTED_FORMAT )
+            ( location, call_number, status ) = ( row['cells'] + ['', '', ''] )[:3]  # padded, so a short row fails an assert below
+            if 'location' in item_spec:
+                assert location == item_spec['location'], f'location.text, ```{location}```'
+            assert call_number == target_callnumber, f'call_number.text, ```{call_number}```'
+            if 'status' in item_spec:
+                assert item_spec['status'] in status, f'status.text, ```{status}```'  # request-access link will also be here (odd but true)
+            if item_spec.get( 'request_access' ) is True:
+                assert 'request-access' in status, f'status.text, ```{status}```'
+                if item_spec.get( 'href' ):
+                    assert row['href'] and item_spec['href'] in row['href'], row['href']
+            elif item_spec.get( 'request_access' ) is False:
+                assert 'request-access' not in status, f'status.text, ```{status}```'
+        return
+
+    ## end class ResultsCheck
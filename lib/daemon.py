@@ -0,0 +1,186 @@
+"""
+Long-running monitoring mode (`checker.py --daemon`).
+
+Keeps its browsers -- the browser pool, or with `BLK_HAY__CHECK_WORKERS` above 1, a persistent worker-process pool --
+and its keep-alive http connections -- the runner's, and one warm-up/fingerprint client -- warm, and re-runs the suite every `BLK_HAY__DAEMON_INTERVAL` seconds,
+start-to-start, plus-or-minus up to `BLK_HAY__DAEMON_JITTER` seconds.
+
+A run in which at least `BLK_HAY__DAEMON_DEGRADED_FRACTION` of the checks fail counts as degraded;
+consecutive degraded runs double the interval, up to `BLK_HAY__DAEMON_MAX_BACKOFF` seconds, so a struggling catalog isn't piled-on.
+A worker-process that dies mid-run breaks the whole worker-pool; the run counts as degraded, and the pool is rebuilt for the next one.
+
+The latest run, and a short history of run-summaries, are kept in memory;
+with `BLK_HAY__DAEMON_STATUS_PORT` set, they're served as json at `/status` (and `/status/history`).
+"""
+
+import collections, datetime, json, logging, random, signal, threading, time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import settings
+from lib import history, runner, supervisor
+from lib.async_http import AsyncClient
+from lib.browser_pool import BrowserPool
+
+
+log = logging.getLogger(__name__)
+
+
+HISTORY_SIZE = 100  # run-summaries kept in memory
+
+
+class Daemon:
+
+    def __init__( self, names=None, incremental=False ):
+        self.names = names or list( runner.CHECKS )
+        self.incremental = incremental
+        self.interval = settings.DAEMON_INTERVAL
+        self.jitter = settings.DAEMON_JITTER
+        self.max_backoff = settings.DAEMON_MAX_BACKOFF
+        self.latest = None
+        self.history = collections.deque( maxlen=HISTORY_SIZE )
+        self.degraded_runs = 0  # consecutive
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.executor = None
+        self.client = None
+
+    def make_executor( self ):
+        """ Returns a worker-process pool, or None when checks run in-process.
+            Called by run_forever() and run_once() """
+        if settings.CHECK_WORKERS > 1:
+            return ProcessPoolExecutor( max_workers=settings.CHECK_WORKERS, initializer=runner.init_worker )
+        return None
+
+    def run_forever( self ):
+        """ Runs the suite on schedule until stop(), then tears the browsers and connections down. """
+        supervisor.reap_orphans()
+        pool = BrowserPool()
+        self.executor = self.make_executor()
+        self.client = AsyncClient( settings.WARMUP_CONCURRENCY )
+        log.info( f'daemon started; `{len(self.names)}` checks every `{self.interval}` seconds' )
+        try:
+            while not self.stopping.is_set():
+                start = time.monotonic()
+                self.run_once( pool )
+                delay = self.next_delay()
+                log.info( f'next run in `{round(delay, 1)}` seconds' )
+                self.stopping.wait( max(delay - (time.monotonic() - start), 0) )
+        finally:
+            if self.executor:
+                self.executor.shutdown( wait=True )
+            self.client.close()
+            pool.shutdown()
+            log.info( 'daemon stopped' )
+        return
+
+    def run_once( self, pool ):
+        """ Runs the suite once and keeps the outcome; a run that blows up is recorded as a degraded run, not raised --
+            and a broken worker-pool is replaced, so the next run doesn't inherit it.
+            Called by run_forever() """
+        started_at = datetime.datetime.now().isoformat()
+        start = time.monotonic()
+        try:
+            results = runner.run_checks( self.names, pool, incremental=self.incremental, executor=self.executor, client=self.client )
+            error = None
+        except BrokenProcessPool as e:
+            log.exception( 'worker-pool broke; rebuilding it; traceback...' )
+            ( results, error ) = ( [], repr(e) )
+            self.executor.shutdown( wait=False, cancel_futures=True )
+            self.executor = self.make_executor()
+        except Exception as e:
+            log.exception( 'run failed; traceback...' )
+            ( results, error ) = ( [], repr(e) )
+        failed = [ result['check'] for result in results if not result['passed'] ]
+        degraded = error is not None or len( failed ) >= settings.DAEMON_DEGRADED_FRACTION * len( self.names )
+        summary = {
+            'started_at': started_at,
+            'seconds': round( time.monotonic() - start, 3 ),
+            'checks': len( results ),
+            'failed': failed,
+            'degraded': degraded,
+            'error': error }
+        with self.lock:
+            self.degraded_runs = self.degraded_runs + 1 if degraded else 0
+            self.latest = dict( summary, results=results )
+            self.history.append( summary )
+        try:
+            history.record_run( results, started_at, mode='daemon' )
+        except Exception:
+            log.exception( 'could not record run-history' )
+        log.info( f'run complete; ```{summary}```' )
+        return summary
+
+    def next_delay( self ):
+        """ Returns the seconds from this run's start to the next's: the interval with jitter, doubled per consecutive degraded run.
+            Called by run_forever() """
+        delay = self.interval
+        if self.degraded_runs:
+            delay = min( self.interval * 2 ** self.degraded_runs, self.max_backoff )
+            log.warning( f'catalog degraded for `{self.degraded_runs}` run(s); backing off' )
+        return max( delay + random.uniform(-self.jitter, self.jitter), 0 )
+
+    def status( self ):
+        with self.lock:
+            return { 'latest': self.latest, 'degraded_runs': self.degraded_runs }
+
+    def stop( self ):
+        log.info( 'daemon stopping after the current run' )
+        self.stopping.set()
+        return
+
+    ## end class Daemon
+
+
+class StatusHandler( BaseHTTPRequestHandler ):
+
+    daemon = None  # set by serve_status()
+
+    def do_GET( self ):
+        if self.path == '/status':
+            return self.respond( 200, self.daemon.status() )
+        if self.path == '/status/history':
+            with self.daemon.lock:
+                return self.respond( 200, list(self.daemon.history) )
+        return self.respond( 404, {'error': 'not found'} )
+
+    def respond( self, status, payload ):
+        data = json.dumps( payload, indent=2 ).encode( 'utf-8' )
+        self.send_response( status )
+        self.send_header( 'Content-Type', 'application/json' )
+        self.send_header( 'Content-Length', str(len(data)) )
+        self.end_headers()
+        self.wfile.write( data )
+        return
+
+    def log_message( self, format, *args ):
+        log.debug( format % args )
+
+    ## end class StatusHandler
+
+
+def serve_status( daemon, port ):
+    """ Serves the daemon's in-memory results on a background thread; returns the server.
+        Called by run() """
+    StatusHandler.daemon = daemon
+    server = ThreadingHTTPServer( ('127.0.0.1', port), StatusHandler )
+    server.daemon_threads = True
+    threading.Thread( target=server.serve_forever, name='status', daemon=True ).start()
+    log.info( f'status at ```http://127.0.0.1:{port}/status```' )
+    return server
+
+
+def run( names=None, incremental=False ):
+    """ Called by checker.py """
+    daemon = Daemon( names, incremental )
+    for signal_number in ( signal.SIGTERM, signal.SIGINT ):  # finish the current run, then shut down cleanly
+        signal.signal( signal_number, lambda *args: daemon.stop() )
+    server = serve_status( daemon, settings.DAEMON_STATUS_PORT ) if settings.DAEMON_STATUS_PORT else None
+    try:
+        daemon.run_forever()
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    return
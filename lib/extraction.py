@@ -0,0 +1,167 @@
+"""
+Single-round-trip page extraction.
+
+Pulls everything the checks assert on as one plain-python structure,
+via one `execute_script()` on a browser, or from the parsed document on the http engine.
+Assertions then run against that snapshot instead of issuing a WebDriver call per field.
+
+Bib-page snapshot...
+    { 'formats': [ text, ... ],
+      'items': [ { 'id': 'item_...', 'index': 0, 'text': '...',
+                   'fields': { class_name: text-or-None, ... },
+                   'hrefs': { class_name: href-or-None, ... } }, ... ] }
+
+Search-results snapshot...
+    { 'documents': [ { 'id': '...', 'index': 0, 'format': text-or-None,
+                       'rows': [ { 'text': '...', 'cells': [ text, ... ], 'href': status-link-href-or-None }, ... ] }, ... ],
+      'next_page': True-if-the-page-links-a-next-results-page }
+
+From a browser, both also carry the page's Navigation and Resource Timing, read in the same round-trip...
+    'timing': { 'ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'availability_observed_ms', 'availability_fetch_ms', 'resources', 'transfer_kb' }
+...milliseconds from navigation-start; None where the event hasn't happened yet (eg `load` while slow assets are still arriving).
+`availability_observed_ms` is when lib/readiness.py saw the targeted cells filled in -- an upper bound on when they were filled,
+since its observer is injected only after page-load, so cells the page filled sooner are seen no sooner than that.
+`availability_fetch_ms` is when the last resource under `BLK_HAY__AVAILABILITY_URL_PATTERN` (its part before `{bib}`) finished arriving --
+the lower bound; None if that's not set. On the http engine, 'timing' is None.
+"""
+
+import logging
+
+import settings
+
+
+log = logging.getLogger(__name__)
+
+
+## mirrors WebDriver's `.text`: empty for unrendered elements; whitespace collapsed and lines trimmed
+VISIBLE_TEXT_JS = """
+function visibleText( el ) {
+    if ( !el ) { return null; }
+    var style = window.getComputedStyle( el );
+    if ( el.getClientRects().length === 0 || style.visibility === 'hidden' ) { return ''; }
+    return el.innerText.split( '\\n' )
+        .map( function(line) { return line.replace( /[\\s\\u00a0]+/g, ' ' ).trim(); } )
+        .filter( function(line) { return line.length > 0; } )
+        .join( '\\n' );
+}
+"""
+
+PAGE_TIMING_JS = """
+function pageTiming( availabilityPrefix ) {
+    var nav = performance.getEntriesByType( 'navigation' )[0];
+    if ( !nav ) { return null; }
+    function ms( value ) { return value > 0 ? Math.round( value ) : null; }
+    var resources = performance.getEntriesByType( 'resource' );
+    var availability = availabilityPrefix ? resources.filter( function(r) { return r.name.indexOf( availabilityPrefix ) === 0; } ) : [];
+    return {
+        ttfb_ms: ms( nav.responseStart ),
+        dom_content_loaded_ms: ms( nav.domContentLoadedEventEnd ),
+        load_ms: ms( nav.loadEventEnd ),
+        availability_observed_ms: window.blkHayObservedAt ? Math.round( window.blkHayObservedAt ) : null,
+        availability_fetch_ms: availability.length ? Math.round( Math.max.apply(null, availability.map(function(r) { return r.responseEnd; })) ) : null,
+        resources: resources.length,
+        transfer_kb: Math.round( resources.reduce(function(sum, r) { return sum + (r.transferSize || 0); }, nav.transferSize || 0) / 1024 ) };
+}
+"""
+
+EXTRACT_PAGE_JS = VISIBLE_TEXT_JS + PAGE_TIMING_JS + """
+var classNames = arguments[0];
+var availabilityPrefix = arguments[1];
+var formats = Array.prototype.map.call(
+    document.getElementsByClassName( 'blacklight-format' ), function(el) { return visibleText( el ); } );
+var items = Array.prototype.map.call( document.getElementsByClassName( 'bib_item' ), function( row, index ) {
+    var fields = {};
+    var hrefs = {};
+    classNames.forEach( function(className) {
+        var el = row.getElementsByClassName( className )[0];
+        fields[className] = visibleText( el );
+        var link = el ? el.querySelector( 'a[href]' ) : null;
+        hrefs[className] = link ? link.href : null;
+    } );
+    return { id: row.id || null, index: index, text: visibleText( row ), fields: fields, hrefs: hrefs };
+} );
+return { formats: formats, items: items, timing: pageTiming( availabilityPrefix ) };
+"""
+
+
+def availability_prefix():
+    """ Returns the availability url-pattern up to `{bib}`, for spotting its requests among the page's resources; None if it's not configured. """
+    return settings.AVAILABILITY_URL_PATTERN.split( '{bib}' )[0] or None
+
+
+def extract_page( driver, class_names ):
+    """ Returns the page-snapshot, reading `class_names` from every `bib_item` row.
+        Called by check_engine.PageCheck.extract() """
+    if hasattr( driver, 'execute_script' ):
+        return driver.execute_script( EXTRACT_PAGE_JS, list(class_names), availability_prefix() )
+    return extract_page_from_document( driver.document, class_names )
+
+
+def extract_page_from_document( document, class_names ):
+    """ Builds the same snapshot from a parsed http_engine document.
+        Called by extract_page() """
+    formats = [ el.text for el in document.find_elements_by_class_name('blacklight-format') ]
+    items = []
+    for ( index, row ) in enumerate( document.find_elements_by_class_name('bib_item') ):
+        fields = {}
+        hrefs = {}
+        for class_name in class_names:
+            matches = row.find_elements_by_class_name( class_name )
+            fields[class_name] = matches[0].text if matches else None
+            links = [ a for a in matches[0].find_elements_by_tag_name('a') if a.attrs.get('href') ] if matches else []
+            hrefs[class_name] = links[0].get_attribute( 'href' ) if links else None
+        items.append( {'id': row.id, 'index': index, 'text': row.text, 'fields': fields, 'hrefs': hrefs} )
+    return { 'formats': formats, 'items': items, 'timing': None }
+
+
+EXTRACT_RESULTS_JS = VISIBLE_TEXT_JS + PAGE_TIMING_JS + """
+var availabilityPrefix = arguments[0];
+var documents = Array.prototype.map.call( document.querySelectorAll( 'div.document' ), function( doc, index ) {
+    var subheadings = doc.getElementsByClassName( 'title-subheading' );
+    var rows = Array.prototype.map.call( doc.getElementsByTagName( 'tr' ), function( row ) {
+        var cells = row.getElementsByTagName( 'td' );
+        var link = cells.length > 2 ? cells[2].querySelector( 'a[href]' ) : null;
+        return {
+            text: visibleText( row ),
+            cells: Array.prototype.map.call( cells, function(cell) { return visibleText( cell ); } ),
+            href: link ? link.href : null };
+    } );
+    return {
+        id: doc.id || null,
+        index: index,
+        format: subheadings.length ? visibleText( subheadings[subheadings.length - 1] ) : null,  // initial non-format line may exist
+        rows: rows };
+} );
+return { documents: documents, next_page: !!document.querySelector( 'a[rel="next"]' ), timing: pageTiming( availabilityPrefix ) };
+"""
+
+
+def extract_results( driver ):
+    """ Returns the search-results snapshot: every `div.document`, its format, and every row's cells.
+        Called by check_engine.ResultsCheck.extract() """
+    if hasattr( driver, 'execute_script' ):
+        return driver.execute_script( EXTRACT_RESULTS_JS, availability_prefix() )
+    return extract_results_from_document( driver.document )
+
+
+def extract_results_from_document( document ):
+    """ Builds the same snapshot from a parsed http_engine document.
+        Called by extract_results() """
+    documents = []
+    for ( index, doc ) in enumerate( document.find_elements_by_css_selector('div.document') ):
+        subheadings = doc.find_elements_by_class_name( 'title-subheading' )
+        rows = []
+        for row in doc.find_elements_by_tag_name( 'tr' ):
+            cells = row.find_elements_by_tag_name( 'td' )
+            links = [ a for a in cells[2].find_elements_by_tag_name('a') if a.attrs.get('href') ] if len( cells ) > 2 else []
+            rows.append( {
+                'text': row.text,
+                'cells': [ cell.text for cell in cells ],
+                'href': links[0].get_attribute( 'href' ) if links else None } )
+        documents.append( {
+            'id': doc.id,
+            'index': index,
+            'format': subheadings[-1].text if subheadings else None,
+            'rows': rows } )
+    next_page = any( 'next' in link.attrs.get('rel', '').split() for link in document.find_elements_by_tag_name('a') )
+    return { 'documents': documents, 'next_page': next_page, 'timing': None }
@@ -0,0 +1,104 @@
+"""
+Persisted failure-list, and targeted re-runs that tell flaky checks from consistently-failing ones.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  (env_bh_selenium) $ python3 ./checker.py --rerun-failed --repetitions 5
+
+Every `checker.py` run updates `BLK_HAY__FAILURES_PATH`: checks that failed are added, with their error's last line; checks that passed are dropped.
+(Checks already run in isolation -- one failure never stops the rest -- so the list holds exactly the checks that failed.)
+
+`--rerun-failed` runs only the listed checks, each `--repetitions` times, the repetitions spread over worker processes,
+then marks each check `consistent` (failed every repetition) or `flaky` (passed some), and records the verdicts in the list.
+"""
+
+import datetime, json, logging, os, tempfile
+
+import settings
+from lib import runner
+from lib.browser_pool import BrowserPool
+
+
+log = logging.getLogger(__name__)
+
+
+def load( path=None ):
+    """ Returns { check-name: { error, failed_at, verdict?, passes? } }; empty if there's no list yet. """
+    path = path or settings.FAILURES_PATH
+    if not os.path.exists( path ):
+        return {}
+    with open( path, 'r' ) as f:
+        return json.loads( f.read() )['failures']
+
+
+def save( failures, path=None ):
+    path = path or settings.FAILURES_PATH
+    directory = os.path.dirname( os.path.abspath(path) )
+    ( fd, temp_path ) = tempfile.mkstemp( dir=directory )
+    with os.fdopen( fd, 'w' ) as f:
+        f.write( json.dumps({'updated_at': datetime.datetime.now().isoformat(), 'failures': failures}, indent=2, sort_keys=True) )
+    os.replace( temp_path, path )
+    return
+
+
+def last_line( error ):
+    lines = [ line for line in ( error or '' ).strip().splitlines() if line.strip() ]
+    return lines[-1].strip() if lines else None
+
+
+def update( results, path=None ):
+    """ Adds the run's failed checks to the list and drops its passed ones; returns the list.
+        Called by checker.py """
+    failures = load( path )
+    now = datetime.datetime.now().isoformat()
+    for result in results:
+        if result.get( 'skipped' ):
+            continue
+        if result['passed']:
+            failures.pop( result['check'], None )
+        else:
+            failures[result['check']] = { 'error': last_line(result['error']), 'failed_at': now }
+    save( failures, path )
+    if failures:
+        log.info( f'`{len(failures)}` failing check(s) listed in ```{path or settings.FAILURES_PATH}```; re-run with `--rerun-failed`' )
+    return failures
+
+
+def classify( results ):
+    """ Returns `consistent` if every repetition failed, otherwise `flaky`. """
+    if not results:
+        raise ValueError( 'no repetitions to classify' )
+    return 'consistent' if not any( result['passed'] for result in results ) else 'flaky'
+
+
+def rerun_failed( repetitions=3, workers=None, path=None, names=None ):
+    """ Re-runs each listed check -- of `names`, if given -- `repetitions` times, in parallel; records and returns { check-name: verdict-dict }. """
+    if repetitions < 1 or ( workers is not None and workers < 1 ):
+        raise ValueError( f'repetitions `{repetitions}` and workers `{workers}` must be at least 1' )
+    failures = load( path )
+    for name in [ name for name in failures if name not in runner.CHECKS ]:
+        log.warning( f'listed check `{name}` no longer exists; dropping it' )
+        failures.pop( name )
+    names = sorted( name for name in failures if names is None or name in names )
+    if not names:
+        log.info( 'no failed checks listed among those selected; nothing to re-run' )
+        save( failures, path )
+        return {}
+    workers = workers or repetitions
+    log.info( f're-running `{len(names)}` check(s) x `{repetitions}`, over `{workers}` worker(s)' )
+    pool = BrowserPool()
+    try:
+        results = runner.dispatch( [name for name in names for _ in range(repetitions)], pool, workers )
+    finally:
+        pool.shutdown()
+    verdicts = {}
+    for name in names:
+        runs = [ result for result in results if result['check'] == name ]
+        verdicts[name] = {
+            'verdict': classify( runs ),
+            'passes': f'{sum(1 for run in runs if run["passed"])}/{len(runs)}',
+            'errors': sorted( {last_line(run['error']) for run in runs if not run['passed']} ) }
+        failures[name].update( verdict=verdicts[name]['verdict'], passes=verdicts[name]['passes'] )
+        log.info( f'{name}: {verdicts[name]["verdict"]} (passed {verdicts[name]["passes"]}); ```{verdicts[name]["errors"]}```' )
+    save( failures, path )
+    return verdicts
@@ -0,0 +1,158 @@
+"""
+Change-detection for incremental runs (`checker.py --incremental`).
+
+Before any browser work, each check's page is pre-fetched over plain http -- conditionally, with the stored ETag/Last-Modified --
+and fingerprinted: a hash of its extracted server-rendered item data (kept as-is on a `304`), plus a hash of the availability data of its bibs.
+A check whose fingerprint matches the one stored by its last *passing* run is skipped, and reported as such.
+
+Results-page bibs are read from `div.document` ids; a check whose availability data can't be observed is never skipped --
+and is logged, with the reason, so an incremental run that can't skip anything says so.
+"""
+
+import asyncio, datetime, hashlib, json, logging, os, re, tempfile
+
+import settings
+from lib import check_engine, extraction
+from lib.async_http import AsyncClient
+from lib.availability_checker import AvailabilityNotConfigured, availability_url
+from lib.http_engine import parse_html
+
+
+log = logging.getLogger(__name__)
+
+
+BIB_PATTERN = re.compile( r'b\d{7}' )
+PATTERN_UNSET = '`BLK_HAY__AVAILABILITY_URL_PATTERN` not set'  # warned about once, by checker.py, rather than per check
+
+
+def digest( data ):
+    return hashlib.sha256( json.dumps(data, sort_keys=True).encode('utf-8') ).hexdigest()
+
+
+class FingerprintStore:
+    """ { check-name: { url, etag, last_modified, page_digest, bibs, availability_digest, passed, checked_at } }, as a json file. """
+
+    def __init__( self, path=None ):
+        self.path = path or settings.FINGERPRINT_PATH
+        self.entries = {}
+        if os.path.exists( self.path ):
+            with open( self.path, 'r' ) as f:
+                self.entries = json.loads( f.read() )
+
+    def unchanged( self, name, current ):
+        """ Returns True if the check's current fingerprint matches that of its last passing run. """
+        previous = self.entries.get( name )
+        if not previous or not previous.get( 'passed' ) or current.get( 'availability_digest' ) is None:
+            return False
+        return ( current['page_digest'] == previous['page_digest'] and current['availability_digest'] == previous['availability_digest'] )
+
+    def update( self, name, current, passed ):
+        self.entries[name] = dict( current, passed=passed, checked_at=datetime.datetime.now().isoformat() )
+
+    def save( self ):
+        directory = os.path.dirname( os.path.abspath(self.path) )
+        ( fd, temp_path ) = tempfile.mkstemp( dir=directory )
+        with os.fdopen( fd, 'w' ) as f:
+            f.write( json.dumps(self.entries, indent=2, sort_keys=True) )
+        os.replace( temp_path, self.path )
+        return
+
+    ## end class FingerprintStore
+
+
+async def take_fingerprint( client, spec, previous ):
+    """ Conditionally pre-fetches the check's page, and its bibs' availability data; returns the fingerprint.
+        Called by take_fingerprints() """
+    url = check_engine.check_url( spec )
+    headers = {}
+    if previous.get( 'etag' ):
+        headers['If-None-Match'] = previous['etag']
+    if previous.get( 'last_modified' ):
+        headers['If-Modified-Since'] = previous['last_modified']
+    response = await client.get( url, headers )
+    current = { 'url': url, 'etag': response.headers.get('etag'), 'last_modified': response.headers.get('last-modified') }
+    if response.status == 304:
+        current.update( {'etag': previous.get('etag'), 'last_modified': previous.get('last_modified'),
+                         'page_digest': previous.get('page_digest'), 'bibs': previous.get('bibs', [])} )
+    else:
+        document = parse_html( response.text, url )
+        if 'query' in spec:
+            data = extraction.extract_results_from_document( document )
+            bibs = sorted( {match.group() for doc in data['documents'] for match in [BIB_PATTERN.search(doc['id'] or '')] if match} )
+        else:
+            data = extraction.extract_page_from_document( document, ['location', 'callnumber'] )
+            bibs = [ spec['bib'] ]
+        current.update( {'page_digest': digest([response.status, data]), 'bibs': bibs} )
+    ( current['availability_digest'], current['unfingerprinted'] ) = await availability_digest( client, current['bibs'] )
+    return current
+
+
+async def availability_digest( client, bibs ):
+    """ Hashes the availability data of the bibs; returns ( digest, None ), or ( None, reason ) if it can't be taken.
+        Called by take_fingerprint() """
+    if not bibs:
+        return ( None, 'no bib-ids found on its page' )
+    bodies = []
+    for bib in bibs:
+        try:
+            url = availability_url( bib )
+        except AvailabilityNotConfigured:
+            return ( None, PATTERN_UNSET )
+        response = await client.get( url, {'Accept': 'application/json'} )
+        if response.status != 200:
+            return ( None, f'availability http `{response.status}` for bib `{bib}`' )
+        try:
+            bodies.append( json.loads(response.text) )
+        except ValueError:
+            bodies.append( response.text )
+    return ( digest(bodies), None )
+
+
+async def take_fingerprints( specs, store, client=None ):
+    owns_client = client is None
+    client = client or AsyncClient( settings.WARMUP_CONCURRENCY )
+
+    async def safely( spec ):
+        try:
+            return await take_fingerprint( client, spec, store.entries.get(spec['name'], {}) )
+        except Exception:
+            log.exception( f'could not fingerprint `{spec["name"]}`; it will run' )
+            return { 'page_digest': None, 'availability_digest': None, 'unfingerprinted': 'pre-fetch failed' }
+
+    try:
+        fingerprints = await asyncio.gather( *[safely(spec) for spec in specs] )
+    finally:
+        if owns_client:
+            client.close()
+    return { spec['name']: fingerprint for ( spec, fingerprint ) in zip( specs, fingerprints ) }
+
+
+def select_changed( specs, store=None, client=None ):
+    """ Fingerprints the specs, over `client` if one's passed; returns ( names-to-run, skipped-results, current-fingerprints, store ).
+        Called by runner.run_checks() """
+    store = store or FingerprintStore()
+    current = asyncio.run( take_fingerprints(specs, store, client) )
+    to_run = []
+    skipped = []
+    for spec in specs:
+        name = spec['name']
+        if current[name].get( 'unfingerprinted' ) == PATTERN_UNSET:
+            log.debug( f'`{name}` can\'t be fingerprinted -- {PATTERN_UNSET}; it will run' )
+        elif current[name].get( 'unfingerprinted' ):
+            log.warning( f'`{name}` can\'t be fingerprinted -- {current[name]["unfingerprinted"]}; it will run' )
+        if store.unchanged( name, current[name] ):
+            skipped.append( {'check': name, 'passed': True, 'skipped': True, 'error': None, 'seconds': 0.0, 'phases': {}} )
+        else:
+            to_run.append( name )
+    log.info( f'incremental: `{len(to_run)}` check(s) changed; `{len(skipped)}` unchanged since their last passing run' )
+    return ( to_run, skipped, current, store )
+
+
+def record( results, current, store ):
+    """ Stores the fingerprints of the checks that ran, with their outcome.
+        Called by runner.run_checks() """
+    for result in results:
+        if not result.get( 'skipped' ) and result['check'] in current:
+            store.update( result['check'], current[result['check']], result['passed'] )
+    store.save()
+    return
@@ -0,0 +1,193 @@
+"""
+SQLite run-history, and latency-regression detection over it.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ python3 -m lib.history report  # compares each check's recent runs with the 7 days before
+  $ python3 -m lib.history report --days 14 --recent 10 --threshold 0.3
+
+Every `checker.py` run (and every daemon run) appends to `BLK_HAY__HISTORY_DB`...
+- `runs`: one row per run
+- `check_results`: per-check outcome and seconds
+- `phase_timings`: per-check phase-seconds -- `acquire`, `navigation`, `readiness`, `extract`, `assert` --
+  and the page's own timing, as `page_ttfb`, `page_load`, `page_availability_observed` etc, also in seconds
+
+The report flags a check-phase whose p95 over its `--recent` runs is more than `--threshold` above its p95 over the preceding `--days`,
+and at least `--min-seconds` above it in absolute terms -- so sub-millisecond phases don't double on noise --
+eg "JohnHayCheck readiness p95 up 40% vs last 7 days"; and any check whose recent failure-rate rose.
+"""
+
+import argparse, contextlib, datetime, logging, sqlite3
+
+import settings
+from lib.stats import percentile
+
+
+log = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    root_page_url TEXT NOT NULL,
+    checks INTEGER NOT NULL,
+    failed INTEGER NOT NULL );
+CREATE TABLE IF NOT EXISTS check_results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    check_name TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    seconds REAL,
+    error TEXT );
+CREATE TABLE IF NOT EXISTS phase_timings (
+    result_id INTEGER NOT NULL REFERENCES check_results(id),
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL );
+CREATE INDEX IF NOT EXISTS check_results_by_check ON check_results ( check_name, started_at );
+CREATE INDEX IF NOT EXISTS check_results_by_run ON check_results ( run_id );
+CREATE INDEX IF NOT EXISTS phase_timings_by_result ON phase_timings ( result_id, phase );
+"""
+
+MIN_BASELINE_SAMPLES = 5  # fewer baseline samples than this aren't compared
+MIN_REGRESSION_SECONDS = 0.05  # a p95 rise smaller than this is noise, however large relative to the baseline
+
+
+@contextlib.contextmanager
+def connect( path=None ):
+    """ Yields a connection with the schema in place; commits on success. """
+    connection = sqlite3.connect( path or settings.HISTORY_DB )
+    try:
+        connection.executescript( SCHEMA )
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+def record_run( results, started_at, mode='run', path=None ):
+    """ Appends a run and its per-check results and phase-timings; returns the run-id. Does nothing if history is disabled.
+        Called by checker.py and lib/daemon.py """
+    if not ( path or settings.HISTORY_DB ):
+        return None
+    with connect( path ) as connection:
+        cursor = connection.execute(
+            'INSERT INTO runs ( started_at, finished_at, mode, root_page_url, checks, failed ) VALUES ( ?, ?, ?, ?, ?, ? )',
+            ( started_at, datetime.datetime.now().isoformat(), mode, settings.ROOT_PAGE_URL, len(results),
+              sum(1 for result in results if not result['passed']) ) )
+        run_id = cursor.lastrowid
+        for result in results:
+            cursor = connection.execute(
+                'INSERT INTO check_results ( run_id, check_name, started_at, passed, skipped, seconds, error ) VALUES ( ?, ?, ?, ?, ?, ?, ? )',
+                ( run_id, result['check'], started_at, int(bool(result['passed'])), int(bool(result.get('skipped'))),
+                  result.get('seconds'), result.get('error') ) )
+            connection.executemany(
+                'INSERT INTO phase_timings ( result_id, phase, seconds ) VALUES ( ?, ?, ? )',
+                [ (cursor.lastrowid, phase, seconds) for (phase, seconds) in timings(result).items() ] )
+    log.info( f'run `{run_id}` recorded in ```{path or settings.HISTORY_DB}```' )
+    return run_id
+
+
+def timings( result ):
+    """ Returns the result's phase-seconds plus its page-timing milliseconds, as `page_<metric>` seconds.
+        Called by record_run() """
+    found = dict( result.get('phases', {}) )
+    for ( metric, value ) in ( result.get('page_timing') or {} ).items():
+        if metric.endswith( '_ms' ) and value is not None:
+            found[ f'page_{metric[:-3]}' ] = value / 1000.0
+    return found
+
+
+## report -----------------------------------------------------------
+
+
+def check_samples( connection, since ):
+    """ Returns { check-name: [ (started_at, passed, { phase: seconds, 'total': seconds }), ... ] }, oldest first, skipped checks left out.
+        Called by find_regressions() """
+    rows = connection.execute(
+        'SELECT r.id, r.check_name, r.started_at, r.passed, r.seconds, p.phase, p.seconds'
+        ' FROM check_results r LEFT JOIN phase_timings p ON p.result_id = r.id'
+        ' WHERE r.started_at >= ? AND r.skipped = 0 ORDER BY r.started_at, r.id', (since,) ).fetchall()
+    samples = {}
+    by_result = {}
+    for ( result_id, name, started_at, passed, seconds, phase, phase_seconds ) in rows:
+        if result_id not in by_result:
+            by_result[result_id] = ( started_at, bool(passed), {'total': seconds} )
+            samples.setdefault( name, [] ).append( by_result[result_id] )
+        if phase is not None:
+            by_result[result_id][2][phase] = phase_seconds
+    return samples
+
+
+def find_regressions( days=7, recent=5, threshold=0.25, path=None, min_seconds=MIN_REGRESSION_SECONDS ):
+    """ Compares each check's last `recent` runs with its runs over the `days` before them; returns trend-rows, regressions flagged.
+        Called by report() """
+    since = ( datetime.datetime.now() - datetime.timedelta(days=days) ).isoformat()
+    with connect( path ) as connection:
+        samples = check_samples( connection, since )
+    trends = []
+    for ( name, runs ) in sorted( samples.items() ):
+        ( baseline, latest ) = ( runs[:-recent], runs[-recent:] )
+        phases = sorted( {phase for run in runs for phase in run[2]} )
+        for phase in phases:
+            before = [ run[2][phase] for run in baseline if run[2].get(phase) is not None ]
+            after = [ run[2][phase] for run in latest if run[2].get(phase) is not None ]
+            if len( before ) < MIN_BASELINE_SAMPLES or not after:
+                continue
+            ( before_p95, after_p95 ) = ( percentile(before, 95), percentile(after, 95) )
+            change = ( after_p95 - before_p95 ) / before_p95 if before_p95 else 0.0
+            trends.append( {
+                'check': name, 'phase': phase, 'baseline_p95': round( before_p95, 3 ), 'recent_p95': round( after_p95, 3 ),
+                'change': round( change, 3 ), 'regressed': change > threshold and after_p95 - before_p95 >= min_seconds } )
+        if len( baseline ) >= MIN_BASELINE_SAMPLES:
+            ( before_rate, after_rate ) = ( failure_rate(baseline), failure_rate(latest) )
+            trends.append( {
+                'check': name, 'phase': 'failure_rate', 'baseline_p95': before_rate, 'recent_p95': after_rate,
+                'change': round( after_rate - before_rate, 3 ), 'regressed': after_rate > before_rate } )
+    return trends
+
+
+def failure_rate( runs ):
+    return round( sum(1 for run in runs if not run[1]) / len(runs), 3 )
+
+
+def report( days=7, recent=5, threshold=0.25, path=None, min_seconds=MIN_REGRESSION_SECONDS ):
+    """ Logs the trend-table and one line per regression; returns the regressions. """
+    trends = find_regressions( days, recent, threshold, path, min_seconds )
+    lines = [ f'{"check":<24} {"phase":<24} {"baseline p95":>13} {"recent p95":>11} {"change":>8}' ]
+    for trend in trends:
+        flag = '  <-- REGRESSED' if trend['regressed'] else ''
+        lines.append(
+            f'{trend["check"]:<24} {trend["phase"]:<24} {trend["baseline_p95"]:>13} {trend["recent_p95"]:>11} {trend["change"]:>+8.1%}{flag}' )
+    log.info( '\n' + '\n'.join(lines) )
+    regressions = [ trend for trend in trends if trend['regressed'] ]
+    for trend in regressions:
+        if trend['phase'] == 'failure_rate':
+            log.warning( f'{trend["check"]} failure-rate up from {trend["baseline_p95"]:.0%} to {trend["recent_p95"]:.0%} vs last {days} days' )
+        else:
+            log.warning( f'{trend["check"]} {trend["phase"]} p95 up {trend["change"]:.0%} vs last {days} days' )
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser( description='Run-history trends and latency-regressions.' )
+    parser.add_argument( 'command', choices=['report'] )
+    parser.add_argument( '--days', type=int, default=7, help='baseline window' )
+    parser.add_argument( '--recent', type=int, default=5, help='latest runs, per check, compared with the baseline' )
+    parser.add_argument( '--threshold', type=float, default=0.25, help='p95 increase flagged as a regression; 0.25 means 25%%' )
+    parser.add_argument( '--min-seconds', type=float, default=MIN_REGRESSION_SECONDS, help='smallest p95 increase, in seconds, flagged as a regression' )
+    parser.add_argument( '--db', default=None, help='default, `BLK_HAY__HISTORY_DB`' )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    args = parse_args()
+    report( args.days, args.recent, args.threshold, args.db, args.min_seconds )
@@ -0,0 +1,318 @@
+"""
+Browser-free check engine for server-rendered markup.
+
+Fetches pages over pooled keep-alive HTTP, parses them with the stdlib html-parser,
+and serves the subset of the WebDriver element-lookup api the checks use
+(`find_element(s)_by_class_name`, `_by_id`, `_by_tag_name`, `_by_css_selector`, `.text`, `get_attribute()`).
+
+Only markup present in the server response is visible -- the `status` cells and request-links
+are filled in by the catalog's availability javascript, so checks asserting on those still need a browser.
+"""
+
+import http.client, logging, re, threading, urllib.parse
+from html.parser import HTMLParser
+
+
+log = logging.getLogger(__name__)
+
+
+JS_POPULATED_CLASSES = [ 'status', 'scan', 'jcb_url', 'hay_aeon_url', 'ezb_volume_url', 'annexhay_easyrequest_url' ]
+
+VOID_TAGS = [ 'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr' ]
+BLOCK_TAGS = [
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figure', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section',
+    'table', 'tbody', 'thead', 'tfoot', 'tr', 'ul' ]
+HIDDEN_TAGS = [ 'head', 'noscript', 'script', 'style', 'template', 'title' ]
+CELL_TAGS = [ 'td', 'th' ]
+
+
+class NoSuchElement( Exception ):
+    """ Mirrors selenium's `NoSuchElementException` for the http engine. """
+    pass
+
+
+## http -------------------------------------------------------------
+
+
+class HttpResponse:
+
+    def __init__( self, url, status, headers, body ):
+        self.url = url
+        self.status = status
+        self.headers = headers  # dict, lower-cased keys
+        self.body = body
+
+    @property
+    def text( self ):
+        return self.body.decode( 'utf-8', errors='replace' )
+
+    ## end class HttpResponse
+
+
+class HttpClient:
+    """ Keep-alive http(s) client; each thread re-uses one connection per host. """
+
+    def __init__( self, timeout=30, user_agent='blacklight_hay_FTcode' ):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.local = threading.local()
+
+    def get( self, url, headers=None, max_redirects=5 ):
+        """ Returns an HttpResponse, following redirects.
+            Called by HttpDriver.get() and async/warm-up helpers. """
+        for _ in range( max_redirects + 1 ):
+            response = self.request( url, headers )
+            location = response.headers.get( 'location' )
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin( url, location )
+                continue
+            return response
+        raise RuntimeError( f'too many redirects, ```{url}```' )
+
+    def request( self, url, headers=None ):
+        """ Issues one GET on a pooled connection; retries once if a kept-alive connection went stale.
+            Called by get() """
+        parts = urllib.parse.urlsplit( url )
+        path = urllib.parse.quote( parts.path or '/', safe='/%:@!$&\'()*+,;=' )
+        if parts.query:
+            path = f'{path}?{urllib.parse.quote(parts.query, safe="=&%[]/:+,")}'
+        all_headers = { 'User-Agent': self.user_agent, 'Accept-Encoding': 'identity' }
+        all_headers.update( headers or {} )
+        for attempt in (1, 2):
+            connection = self.connection_for( parts )
+            try:
+                connection.request( 'GET', path, headers=all_headers )
+                raw = connection.getresponse()
+                body = raw.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self.drop_connection( parts )
+                if attempt == 2:
+                    raise
+                continue
+            response_headers = { k.lower(): v for (k, v) in raw.getheaders() }
+            if response_headers.get( 'connection', '' ).lower() == 'close':
+                self.drop_connection( parts )
+            return HttpResponse( url, raw.status, response_headers, body )
+
+    def connection_for( self, parts ):
+        """ Returns this thread's connection for the url's scheme/host/port.
+            Called by request() """
+        connections = self.local.__dict__.setdefault( 'connections', {} )
+        key = ( parts.scheme, parts.netloc )
+        if key not in connections:
+            connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            connections[key] = connection_class( parts.netloc, timeout=self.timeout )
+        return connections[key]
+
+    def drop_connection( self, parts ):
+        connections = self.local.__dict__.setdefault( 'connections', {} )
+        connection = connections.pop( (parts.scheme, parts.netloc), None )
+        if connection:
+            connection.close()
+        return
+
+    def close( self ):
+        """ Closes the calling thread's connections. """
+        for connection in self.local.__dict__.get( 'connections', {} ).values():
+            connection.close()
+        self.local.__dict__['connections'] = {}
+        return
+
+    ## end class HttpClient
+
+
+## dom --------------------------------------------------------------
+
+
+class HttpElement:
+    """ Parsed element offering the WebDriver lookups the checks use. """
+
+    def __init__( self, tag, attrs, parent=None ):
+        self.tag_name = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []  # HttpElements and text-strings
+
+    @property
+    def id( self ):
+        return self.attrs.get( 'id' )
+
+    @property
+    def classes( self ):
+        return ( self.attrs.get('class') or '' ).split()
+
+    @property
+    def text( self ):
+        """ Approximates WebDriver's rendered text: collapsed whitespace, one line per block, trimmed. """
+        pieces = []
+        self.collect_text( pieces )
+        lines = [ re.sub(r'\s+', ' ', line).strip() for line in ''.join(pieces).split('\n') ]
+        return '\n'.join( line for line in lines if line )
+
+    def collect_text( self, pieces ):
+        if self.tag_name in HIDDEN_TAGS:
+            return
+        if self.tag_name in BLOCK_TAGS or self.tag_name == 'br':
+            pieces.append( '\n' )
+        for child in self.children:
+            if isinstance( child, str ):
+                pieces.append( child.replace('\n', ' ') )
+            else:
+                child.collect_text( pieces )
+                if child.tag_name in CELL_TAGS:
+                    pieces.append( ' ' )
+        if self.tag_name in BLOCK_TAGS:
+            pieces.append( '\n' )
+        return
+
+    def get_attribute( self, name ):
+        value = self.attrs.get( name )
+        if name == 'href' and value is not None:
+            value = urllib.parse.urljoin( self.base_url(), value )  # WebDriver returns absolute hrefs
+        return value
+
+    def base_url( self ):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return getattr( node, 'url', '' )
+
+    def iter_descendants( self ):
+        for child in self.children:
+            if not isinstance( child, str ):
+                yield child
+                yield from child.iter_descendants()
+
+    ## lookups
+
+    def find_elements_by_class_name( self, name ):
+        return [ el for el in self.iter_descendants() if name in el.classes ]
+
+    def find_elements_by_tag_name( self, name ):
+        return [ el for el in self.iter_descendants() if el.tag_name == name.lower() ]
+
+    def find_elements_by_id( self, id_ ):
+        return [ el for el in self.iter_descendants() if el.id == id_ ]
+
+    def find_elements_by_css_selector( self, selector ):
+        """ Supports descendant-chains of `tag`, `.class`, `#id` and `tag.class` -- enough for the checks' selectors. """
+        matches = [ self ]
+        for step in selector.split():
+            found = []
+            for node in matches:
+                for el in node.iter_descendants():
+                    if matches_simple_selector( el, step ) and el not in found:
+                        found.append( el )
+            matches = found
+        return matches
+
+    def find_element_by_class_name( self, name ):
+        return first_or_raise( self.find_elements_by_class_name(name), f'class `{name}`' )
+
+    def find_element_by_tag_name( self, name ):
+        return first_or_raise( self.find_elements_by_tag_name(name), f'tag `{name}`' )
+
+    def find_element_by_id( self, id_ ):
+        return first_or_raise( self.find_elements_by_id(id_), f'id `{id_}`' )
+
+    def find_element_by_css_selector( self, selector ):
+        return first_or_raise( self.find_elements_by_css_selector(selector), f'selector `{selector}`' )
+
+    ## end class HttpElement
+
+
+def matches_simple_selector( element, step ):
+    """ Matches one compound selector, eg `div.document`, `#item_1`, `.status`.
+        Called by HttpElement.find_elements_by_css_selector() """
+    if step.startswith( '#' ):
+        return element.id == step[1:]
+    ( tag, *class_names ) = step.split( '.' )
+    if tag and element.tag_name != tag.lower():
+        return False
+    return all( class_name in element.classes for class_name in class_names if class_name )
+
+
+def first_or_raise( elements, description ):
+    if not elements:
+        raise NoSuchElement( f'unable to locate element, {description}' )
+    return elements[0]
+
+
+class DocumentBuilder( HTMLParser ):
+    """ Builds an HttpElement tree, tolerating the unclosed tags real-world html contains. """
+
+    def __init__( self, url ):
+        super().__init__( convert_charrefs=True )
+        self.root = HttpElement( '#document', {} )
+        self.root.url = url
+        self.current = self.root
+
+    def handle_starttag( self, tag, attrs ):
+        element = HttpElement( tag, { k: (v if v is not None else '') for (k, v) in attrs }, self.current )
+        self.current.children.append( element )
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag( self, tag, attrs ):
+        self.handle_starttag( tag, attrs )
+        if tag not in VOID_TAGS:
+            self.current = self.current.parent
+
+    def handle_endtag( self, tag ):
+        node = self.current
+        while node is not self.root and node.tag_name != tag:
+            node = node.parent
+        if node is not self.root:  # ignore stray end-tags
+            self.current = node.parent
+
+    def handle_data( self, data ):
+        self.current.children.append( data )
+
+    ## end class DocumentBuilder
+
+
+def parse_html( html, url='' ):
+    """ Returns the root HttpElement of `html`.
+        Called by HttpDriver.get() and snapshot-replay. """
+    builder = DocumentBuilder( url )
+    builder.feed( html )
+    builder.close()
+    return builder.root
+
+
+## driver -----------------------------------------------------------
+
+
+class HttpDriver:
+    """ Stands in for a browser on checks that only read server-rendered markup. """
+
+    def __init__( self, client=None ):
+        self.owns_client = client is None
+        self.client = client or HttpClient()
+        self.document = parse_html( '' )
+        self.current_url = None
+        self.page_source = ''
+
+    def get( self, url ):
+        response = self.client.get( url )
+        if response.status >= 400:
+            raise RuntimeError( f'http `{response.status}` for url, ```{url}```' )
+        self.current_url = response.url
+        self.page_source = response.text
+        self.document = parse_html( self.page_source, response.url )
+        return
+
+    def __getattr__( self, name ):
+        if name.startswith( 'find_element' ):
+            return getattr( self.document, name )  # lookups are served by the parsed document
+        raise AttributeError( name )
+
+    def close( self ):
+        if self.owns_client:  # a shared client keeps its connections warm for the next check
+            self.client.close()
+
+    def quit( self ):
+        self.close()
+
+    ## end class HttpDriver
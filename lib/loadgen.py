@@ -0,0 +1,166 @@
+"""
+Load-generation against a test catalog, driven by the checks' own urls.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ export BLK_HAY__ROOT_PAGE_URL=https://<staging-host>/catalog
+  $ python3 -m lib.loadgen --rate 5 --concurrency 20 --duration 120
+  $ python3 -m lib.loadgen --rate 2 --duration 60 --checks JohnHayCheck --availability
+
+Replays every check's page-url -- bib pages (John Hay's `?limit=false` included) and the faceted `Archives/Manuscripts` searches --
+round-robin, over the async http client, at a fixed open-loop rate: requests are scheduled whether or not earlier ones have finished,
+and up to `--concurrency` are in flight. `--availability` adds each bib's availability data-source url, as the page-javascript would call it.
+
+Reports, per url-kind and overall: latency percentiles -- both from the actual send, and from the scheduled send, which includes
+time queued behind a saturated server -- error-rate, and achieved throughput; and writes them, as json, to `--output`.
+
+Refuses to run against `BLK_HAY__LOADGEN_REFUSED_HOSTS` (by default, the production catalog).
+"""
+
+import argparse, asyncio, datetime, json, logging, time, urllib.parse
+
+import settings
+from lib import check_engine, runner
+from lib.async_http import AsyncClient
+from lib.availability_checker import availability_url
+from lib.stats import percentile, summarize
+
+
+log = logging.getLogger(__name__)
+
+
+def build_targets( specs, include_availability=False ):
+    """ Returns ( kind, url ) pairs: each spec's page-url, and optionally its bib's availability url; duplicates dropped.
+        Called by run() """
+    targets = []
+    for spec in specs:
+        kind = 'results' if 'query' in spec else ( 'bib_all_items' if spec.get('all_items') else 'bib' )
+        targets.append( (kind, check_engine.check_url(spec)) )
+        if include_availability and 'bib' in spec:
+            targets.append( ('availability', availability_url(spec['bib'])) )
+    return list( dict.fromkeys(targets) )
+
+
+class RefusedHost( Exception ):
+    """ Raised for a url on one of `BLK_HAY__LOADGEN_REFUSED_HOSTS`; an exception, not an assert, so `python -O` can't strip the guard. """
+    pass
+
+
+def assert_not_production( url ):
+    host = urllib.parse.urlsplit( url ).hostname
+    if host in settings.LOADGEN_REFUSED_HOSTS:
+        raise RefusedHost( f'refusing to load-test host, ```{host}```; point BLK_HAY__ROOT_PAGE_URL elsewhere' )
+    return
+
+
+async def generate( client, targets, rate, duration, concurrency ):
+    """ Sends requests round-robin over the targets at `rate` per second for `duration` seconds; returns one sample-dict per request.
+        Called by run() """
+    semaphore = asyncio.Semaphore( concurrency )
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    samples = []
+
+    async def send( kind, url, scheduled ):
+        async with semaphore:
+            sent = loop.time()
+            sample = { 'kind': kind, 'status': None, 'error': None }
+            try:
+                response = await client.get( url )
+                sample['status'] = response.status
+            except Exception as e:
+                sample['error'] = repr( e )
+            finished = loop.time()
+            sample['seconds'] = finished - sent
+            sample['seconds_from_schedule'] = finished - scheduled
+            samples.append( sample )
+
+    tasks = []
+    total = int( rate * duration )
+    for n in range( total ):
+        scheduled = start + n / rate
+        await asyncio.sleep( max(scheduled - loop.time(), 0) )
+        ( kind, url ) = targets[ n % len(targets) ]
+        tasks.append( asyncio.create_task(send(kind, url, scheduled)) )
+    await asyncio.gather( *tasks )
+    return samples
+
+
+def summarize_samples( samples, elapsed ):
+    """ Returns latency percentiles, error-rate and throughput for the samples.
+        Called by report() """
+    latencies = [ s['seconds'] for s in samples ]
+    errors = [ s for s in samples if s['error'] or s['status'] >= 400 ]
+    summary = summarize( latencies )
+    summary['p50'] = summary.pop( 'median' )
+    summary['p90'] = round( percentile(latencies, 90), 4 ) if latencies else None
+    summary['p99'] = round( percentile(latencies, 99), 4 ) if latencies else None
+    queued = [ s['seconds_from_schedule'] for s in samples ]
+    summary['p95_from_schedule'] = round( percentile(queued, 95), 4 ) if queued else None
+    summary['error_rate'] = round( len(errors) / len(samples), 4 ) if samples else None
+    summary['throughput_per_second'] = round( len(samples) / elapsed, 2 ) if elapsed else None
+    return summary
+
+
+def report( samples, elapsed ):
+    """ Logs the summary-table; returns the summaries by url-kind, plus `all` -- empty if no request was sent. """
+    if not samples:
+        log.warning( 'no requests sent; `--rate` x `--duration` must come to at least one' )
+        return {}
+    by_kind = {}
+    for sample in samples:
+        by_kind.setdefault( sample['kind'], [] ).append( sample )
+    summaries = { kind: summarize_samples(kind_samples, elapsed) for ( kind, kind_samples ) in sorted( by_kind.items() ) }
+    summaries['all'] = summarize_samples( samples, elapsed )
+    lines = [ f'{"kind":<14} {"count":>6} {"p50":>8} {"p95":>8} {"p99":>8} {"p95-sched":>10} {"errors":>7} {"req/s":>7}' ]
+    for ( kind, s ) in summaries.items():
+        lines.append(
+            f'{kind:<14} {s["count"]:>6} {s["p50"]:>8} {s["p95"]:>8} {s["p99"]:>8} {s["p95_from_schedule"]:>10} {s["error_rate"]:>7.1%} {s["throughput_per_second"]:>7}' )
+    log.info( '\n' + '\n'.join(lines) )
+    return summaries
+
+
+def run( names=None, rate=2.0, duration=60, concurrency=10, include_availability=False ):
+    """ Load-tests the named checks' urls; returns the summary. """
+    assert_not_production( settings.ROOT_PAGE_URL )
+    specs = [ runner.CHECKS[name] for name in (names or runner.CHECKS) ]
+    targets = build_targets( specs, include_availability )
+    for ( _, url ) in targets:
+        assert_not_production( url )
+    log.info( f'`{len(targets)}` urls at `{rate}` req/s for `{duration}` seconds, concurrency `{concurrency}`' )
+    client = AsyncClient( concurrency )
+    start = time.monotonic()
+    try:
+        samples = asyncio.run( generate(client, targets, rate, duration, concurrency) )
+    finally:
+        client.close()
+    elapsed = time.monotonic() - start
+    return {
+        'run_at': datetime.datetime.now().isoformat(),
+        'root_page_url': settings.ROOT_PAGE_URL,
+        'rate': rate, 'duration': duration, 'concurrency': concurrency,
+        'elapsed_seconds': round( elapsed, 3 ),
+        'summaries': report( samples, elapsed ) }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser( description='Load-test a non-production catalog with the checks\' urls.' )
+    parser.add_argument( '--rate', type=float, default=2.0, help='requests per second' )
+    parser.add_argument( '--duration', type=float, default=60, help='seconds' )
+    parser.add_argument( '--concurrency', type=int, default=10, help='max requests in flight' )
+    parser.add_argument( '--checks', nargs='*', default=None, help='check-names; default, all' )
+    parser.add_argument( '--availability', action='store_true', help='also hit each bib\'s availability data-source' )
+    parser.add_argument( '--output', default='loadgen_output.json' )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    args = parse_args()
+    summary = run( args.checks, args.rate, args.duration, args.concurrency, args.availability )
+    with open( args.output, 'w' ) as f:
+        f.write( json.dumps(summary, indent=2) )
+    log.info( f'load-test summary written to ```{args.output}```' )
@@ -0,0 +1,74 @@
+"""
+Process memory and cpu readings from `/proc` (linux), for a browser's whole process-tree --
+Firefox runs content in child processes, so the parent's own RSS undercounts badly.
+
+Where `/proc` isn't available, readings are None rather than errors.
+"""
+
+import logging, os
+
+
+log = logging.getLogger(__name__)
+
+
+PAGE_SIZE = os.sysconf( 'SC_PAGE_SIZE' ) if hasattr( os, 'sysconf' ) else 4096
+CLOCK_TICKS = os.sysconf( 'SC_CLK_TCK' ) if hasattr( os, 'sysconf' ) else 100
+
+
+def read_stat( pid ):
+    """ Returns ( ppid, cpu-seconds, rss-bytes ) from `/proc/<pid>/stat`; None if the process is gone. """
+    try:
+        with open( f'/proc/{pid}/stat', 'r' ) as f:
+            data = f.read()
+    except OSError:
+        return None
+    fields = data.rsplit( ')', 1 )[1].split()  # the command-name, in parens, may contain spaces
+    ( ppid, utime, stime, rss_pages ) = ( int(fields[1]), int(fields[11]), int(fields[12]), int(fields[21]) )
+    return ( ppid, (utime + stime) / CLOCK_TICKS, rss_pages * PAGE_SIZE )
+
+
+def children_by_parent():
+    tree = {}
+    for entry in os.listdir( '/proc' ):
+        if entry.isdigit():
+            stat = read_stat( int(entry) )
+            if stat:
+                tree.setdefault( stat[0], [] ).append( int(entry) )
+    return tree
+
+
+def process_tree( pid ):
+    """ Returns the pid and all its descendants' pids. """
+    tree = children_by_parent()
+    pids = []
+    pending = [ pid ]
+    while pending:
+        current = pending.pop()
+        pids.append( current )
+        pending.extend( tree.get(current, []) )
+    return pids
+
+
+def tree_usage( pid ):
+    """ Returns { pids, rss_mb, cpu_seconds } summed over the process-tree; None if unavailable. """
+    if pid is None or not os.path.isdir( '/proc' ):
+        return None
+    stats = [ stat for stat in (read_stat(p) for p in process_tree(pid)) if stat ]
+    if not stats:
+        return None
+    return {
+        'pids': len( stats ),
+        'rss_mb': round( sum(stat[2] for stat in stats) / 1024 / 1024, 1 ),
+        'cpu_seconds': round( sum(stat[1] for stat in stats), 2 ) }
+
+
+def browser_pid( browser ):
+    """ Returns the Firefox pid geckodriver reports, if any. """
+    try:
+        return browser.capabilities.get( 'moz:processID' )
+    except Exception:
+        return None
+
+
+def browser_usage( browser ):
+    return tree_usage( browser_pid(browser) )
@@ -0,0 +1,111 @@
+"""
+Event-driven page-readiness, replacing the global `implicitly_wait()`.
+
+The `status` cells and request-links are filled in by the catalog's availability javascript after page-load.
+An injected MutationObserver reports back the moment every targeted cell is populated,
+and fails fast -- with the reason -- when a targeted row isn't on the loaded page at all, or the availability data never arrives.
+"""
+
+import logging
+
+import settings
+
+
+log = logging.getLogger(__name__)
+
+
+WAIT_FOR_AVAILABILITY_JS = """
+var targets = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+var finished = false;
+
+function cellText( el ) { return el ? el.textContent.trim() : ''; }
+
+function pageState() {
+    var rows = Array.prototype.slice.call( document.getElementsByClassName( 'bib_item' ) );
+    var wanted = [];
+    var missing = [];
+    (targets.item_ids || []).forEach( function(id) {
+        var row = document.getElementById( id );
+        if ( row ) { wanted.push( row ); } else { missing.push( id ); }
+    } );
+    (targets.indexes || []).forEach( function(index) {
+        if ( rows[index] ) { wanted.push( rows[index] ); } else { missing.push( 'bib_item[' + index + ']' ); }
+    } );
+    if ( !(targets.item_ids || []).length && !(targets.indexes || []).length ) {
+        wanted = rows;
+        if ( !rows.length ) { missing.push( 'any bib_item row' ); }
+    }
+    var pending = wanted.filter( function(row) { return !cellText( row.getElementsByClassName('status')[0] ); } )
+        .map( function(row) { return row.id || 'bib_item'; } );
+    return { missing: missing, pending: pending };
+}
+
+function resultsState() {
+    var rows = Array.prototype.slice.call( document.querySelectorAll( 'div.document tr' ) );
+    var missing = [];
+    var pending = [];
+    (targets.callnumbers || []).forEach( function(callnumber) {
+        var row = rows.filter( function(r) { return cellText( r.getElementsByTagName('td')[1] ) === callnumber; } )[0];
+        if ( !row && !targets.partial ) {  // single-page: the substring-match the original checks used; with pages to come, a near-miss isn't the target
+            row = rows.filter( function(r) { return r.textContent.indexOf( callnumber ) !== -1; } )[0];
+        }
+        if ( !row ) { missing.push( callnumber ); return; }
+        if ( !cellText( row.getElementsByTagName('td')[2] ) ) { pending.push( callnumber ); }
+    } );
+    if ( !document.querySelector( 'div.document' ) ) { missing.push( 'any div.document' ); }
+    return { missing: missing, pending: pending };
+}
+
+function finish( ready, reason, state ) {
+    if ( finished ) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout( timer );
+    window.blkHayObservedAt = performance.now();
+    done( { ready: ready, reason: reason, pending: state.pending, missing: state.missing,
+            elapsed_ms: Math.round( performance.now() - start ) } );
+}
+
+function check() {
+    var state = targets.kind === 'results' ? resultsState() : pageState();
+    if ( targets.partial && document.readyState === 'complete' && !state.pending.length ) {
+        finish( true, null, state );  // targets may be on a later results-page; the ones here are filled in
+    } else if ( state.missing.length && document.readyState === 'complete' ) {
+        finish( false, 'not on page: ' + state.missing.join( ', ' ), state );
+    } else if ( !state.missing.length && !state.pending.length ) {
+        finish( true, null, state );
+    }
+}
+
+var observer = new MutationObserver( check );
+var timer = setTimeout( function() {
+    var state = targets.kind === 'results' ? resultsState() : pageState();
+    finish( false, 'timed out waiting for availability data: ' + state.pending.concat( state.missing ).join( ', ' ), state );
+}, timeoutMs );
+observer.observe( document.documentElement, { childList: true, subtree: true, characterData: true } );
+document.addEventListener( 'readystatechange', check );
+check();
+"""
+
+
+class PageNotReady( Exception ):
+    """ Raised when a page's availability data doesn't arrive, or a targeted row is absent. """
+    pass
+
+
+def wait_until_ready( driver, targets, timeout=None ):
+    """ Blocks until the targeted rows' availability cells are populated; returns the observer's report.
+        `targets` is { 'kind': 'page'|'results', 'item_ids': [...], 'indexes': [...], 'callnumbers': [...], 'partial': bool };
+        with `partial`, absent targets aren't a failure -- the report's `missing` lists them.
+        Called by check_engine.BaseCheck.load_page() """
+    if not hasattr( driver, 'execute_async_script' ):
+        return { 'ready': True, 'reason': None, 'elapsed_ms': 0 }  # http engine: nothing is filled in later
+    timeout = timeout or settings.BROWSER_WAIT_SECONDS
+    state = driver.execute_async_script( WAIT_FOR_AVAILABILITY_JS, targets, timeout * 1000 )
+    if not state['ready']:
+        raise PageNotReady( f'{state["reason"]} (after `{state["elapsed_ms"]}`ms)' )
+    log.debug( f'page ready after `{state["elapsed_ms"]}`ms' )
+    return state
@@ -0,0 +1,29 @@
+"""
+The Hay request-link rules the checks encode, as one function.
+
+- `RESTRICTED` in the status or the callnumber: no link
+- `ANNEX HAY` and `AVAILABLE`: the easyrequest-hay link, `annexhay_easyrequest_url`
+- a Hay reading-room location (`HAY MANUSCRIPTS`, `HAY MICROFLM`, `HAY JOHN-HAY`, `HAY ARCHIVES`)
+  with a requestable status (`AVAILABLE`, `USE IN LIBRARY`): the direct Aeon link, `hay_aeon_url`
+- anything else, eg `DUE ...` or `--`: no link
+"""
+
+ANNEX_LOCATION = 'ANNEX HAY'
+AEON_LOCATIONS = [ 'HAY MANUSCRIPTS', 'HAY MICROFLM', 'HAY JOHN-HAY', 'HAY ARCHIVES' ]
+REQUESTABLE_STATUSES = [ 'AVAILABLE', 'USE IN LIBRARY' ]
+
+
+def is_hay_location( location ):
+    return ( location or '' ).strip() in [ ANNEX_LOCATION ] + AEON_LOCATIONS
+
+
+def expected_link( location, status, callnumber ):
+    """ Returns the request-link class an item should show, or None for no link. """
+    ( location, status, callnumber ) = ( (location or '').strip(), (status or '').strip(), (callnumber or '').strip() )
+    if 'RESTRICTED' in status or 'RESTRICTED' in callnumber:
+        return None
+    if location == ANNEX_LOCATION:
+        return 'annexhay_easyrequest_url' if status == 'AVAILABLE' else None
+    if location in AEON_LOCATIONS and status in REQUESTABLE_STATUSES:
+        return 'hay_aeon_url'
+    return None
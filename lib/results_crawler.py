@@ -0,0 +1,87 @@
+"""
+Lazy, paginated walk of search-results, for `check_engine.ResultsCheck`.
+
+A target callnumber can sit beyond the first results-page once a collection has more matching bibs than a page holds.
+`ResultsCrawler.rows()` is a generator: it extracts one page at a time (one round-trip each), yields that page's rows,
+and follows the page's `rel="next"` link only while some target callnumber is still unseen -- stopping the moment the last one turns up,
+or after `max_pages`. Pages are requested as `<url>&page=N`; `per_page`, if configured, is already on the url.
+"""
+
+import contextlib, logging
+
+import settings
+from lib import extraction, readiness, snapshots
+from lib.results_index import ResultsIndex
+
+
+log = logging.getLogger(__name__)
+
+
+class ResultsCrawler:
+
+    def __init__( self, driver, first_page_url, callnumbers, max_pages, timer=None ):
+        self.driver = driver
+        self.first_page_url = first_page_url
+        self.remaining = list( callnumbers )
+        self.max_pages = max_pages
+        self.timer = timer
+        self.index = ResultsIndex( {'documents': []} )  # every crawled document, in crawl-order
+        self.pages_read = 0
+        self.first_timing = None  # the first page's Navigation/Resource Timing
+
+    def page_url( self, page ):
+        return self.first_page_url if page == 1 else f'{self.first_page_url}&page={page}'
+
+    def snapshots( self ):
+        """ Yields ( page-number, snapshot ) per results-page; the first page is expected to be loaded already, by `load_page()`.
+            Called by rows() """
+        for page in range( 1, self.max_pages + 1 ):
+            if page > 1:
+                self.load( page )
+            snapshot = extraction.extract_results( self.driver )
+            self.pages_read = page
+            if page == 1:
+                self.first_timing = snapshot.get( 'timing' )
+            yield ( page, snapshot )
+            if not snapshot.get( 'next_page' ) or not snapshot['documents']:
+                return
+
+    def load( self, page ):
+        """ Navigates to a later results-page and waits for whichever still-unseen targets it holds.
+            Called by snapshots() """
+        url = self.page_url( page )
+        log.info( f'`{len(self.remaining)}` target(s) not yet seen; hitting url, ```{url}```' )
+        with ( self.timer.phase('pagination') if self.timer else contextlib.nullcontext() ):
+            self.driver.get( url )
+            readiness.wait_until_ready( self.driver, {'kind': 'results', 'callnumbers': self.remaining, 'partial': True} )
+        if settings.SNAPSHOT_MODE == 'record':
+            snapshots.record( url, self.driver )
+        return
+
+    def rows( self ):
+        """ Yields every row, page by page, as it's indexed -- and stops as soon as every target callnumber has been seen. """
+        offset = 0
+        for ( page, snapshot ) in self.snapshots():
+            for document in snapshot['documents']:
+                document['index'] = offset  # crawl-wide position, so `first_bib_only` still means the very first result
+                document['page'] = page
+                offset += 1
+                self.index.add_document( document )
+                for row in document['rows']:
+                    self.mark_found( row )
+                    yield row
+                    if not self.remaining:
+                        log.debug( f'every target seen on results-page `{page}`; stopping' )
+                        return
+        return
+
+    def mark_found( self, row ):
+        """ Drops the targets the row's callnumber-cell matches exactly.
+            A substring-match doesn't count -- `Ms.HAY Box 2` is inside `Ms.HAY Box 20` -- so the crawl goes on to the page with the real row;
+            ResultsIndex.find() falls back to substring-matching only once the crawl is over. """
+        cells = row['cells']
+        self.remaining = [ callnumber for callnumber in self.remaining if not ( len(cells) > 1 and cells[1] == callnumber ) ]
+        return
+
+    ## end class ResultsCrawler
+
@@ -0,0 +1,60 @@
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+class ResultsIndex:
+    """ Every row of a search-results snapshot, read once and keyed by callnumber and by document id,
+        each row tagged with its bib's format -- so target lookups are dict hits, not page re-scans. """
+
+    def __init__( self, snapshot ):
+        self.documents = []
+        self.by_callnumber = {}
+        self.by_document = {}
+        for document in snapshot['documents']:
+            self.add_document( document )
+        log.debug( f'indexed `{len(self.by_callnumber)}` callnumbers across `{len(self.documents)}` documents' )
+
+    def add_document( self, document ):
+        """ Indexes one document's rows; documents from later results-pages are added as they're crawled.
+            Called by __init__() and lib/results_crawler.py """
+        self.documents.append( document )
+        self.by_document[ document['id'] or document['index'] ] = document
+        for row in document['rows']:
+            row['document_id'] = document['id']
+            row['document_index'] = document['index']
+            row['format'] = document['format']
+            if len( row['cells'] ) > 1:
+                self.by_callnumber.setdefault( row['cells'][1], row )  # first occurrence wins, as the old page-scan did
+        return
+
+    def find( self, target_callnumber, first_bib_only=False ):
+        """ Returns the first row for the callnumber, or None.
+            Falls back to the substring-match the original checks used when no cell matches exactly.
+            Called by check_engine.ResultsCheck.assert_snapshot() """
+        row = self.by_callnumber.get( target_callnumber )
+        if row is None:
+            row = self.scan( target_callnumber )
+        if row is not None and first_bib_only and row['document_index'] != 0:
+            return None
+        return row
+
+    def scan( self, target_callnumber ):
+        for document in self.documents:
+            for row in document['rows']:
+                if target_callnumber in ( row['text'] or '' ):
+                    return row
+        return None
+
+    def document( self, document_id ):
+        return self.by_document.get( document_id )
+
+    ## end class ResultsIndex
+
+
+def check_format( row, expected ):
+    """ Checks the format of the row's bib.
+        Called by check_engine.ResultsCheck.assert_snapshot() """
+    assert row['format'] == expected, f'format.text, `{row["format"]}`'
+    return
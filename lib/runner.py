@@ -0,0 +1,124 @@
+import contextlib, logging, time, traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+import settings
+from lib import check_engine, fingerprints, page_checks, results_checks, snapshots, warmup
+from lib.browser_pool import BrowserPool
+from lib.http_engine import HttpClient, HttpDriver
+from lib.tracing import CommandTracer
+
+
+log = logging.getLogger(__name__)
+
+
+PAGE_CHECKS = [ spec['name'] for spec in page_checks.SPECS ]
+RESULTS_CHECKS = [ spec['name'] for spec in results_checks.SPECS ]
+
+CHECKS = { spec['name']: spec for spec in page_checks.SPECS + results_checks.SPECS }
+
+
+worker_pool = None  # each worker-process's own browser pool; set by init_worker()
+http_client = HttpClient()  # shared by http-engine checks so connections stay warm
+
+
+def init_worker():
+    """ Gives a worker-process its own one-browser pool, quit when the worker exits.
+        Called by ProcessPoolExecutor on worker start. """
+    global worker_pool
+    worker_pool = BrowserPool( size=1 )
+    util.Finalize( None, worker_pool.shutdown, exitpriority=10 )
+    return
+
+
+@contextlib.contextmanager
+def borrow_driver( engine, pool ):
+    """ Yields a snapshot-replay driver, an HttpDriver, or a pooled browser, for the engine.
+        Called by run_named_check() """
+    if engine == 'replay':
+        yield snapshots.ReplayDriver()
+    elif engine == 'http':
+        driver = HttpDriver( http_client )
+        try:
+            yield driver
+        finally:
+            driver.quit()
+    else:
+        with pool.borrow() as browser:
+            yield browser
+
+
+def run_named_check( name, pool=None ):
+    """ Runs one check's parts, each on a borrowed driver -- a failing server-rendered part spares the browser; returns a result-dict rather than raising.
+        Phases of an http part that precedes a browser part are prefixed `http_`.
+        Called by run_checks(), in-process or in a worker. """
+    pool = pool or worker_pool
+    spec = CHECKS[name]
+    parts = check_engine.check_parts( spec )
+    result = { 'check': name, 'passed': False, 'error': None, 'seconds': None, 'phases': {}, 'engines': [engine for ( _, engine ) in parts] }
+    start = time.monotonic()
+    check = None
+    tracer = None
+    try:
+        for ( part, engine ) in parts:
+            prefix = 'http_' if engine == 'http' and len( parts ) > 1 else ''
+            acquiring = time.monotonic()
+            with borrow_driver( engine, pool ) as driver:
+                result['phases'][f'{prefix}acquire'] = round( time.monotonic() - acquiring, 4 )
+                check = check_engine.make_check( part, driver )
+                if settings.TRACE_COMMANDS and hasattr( driver, 'execute' ):
+                    tracer = CommandTracer( driver, name, phase_of=lambda: check.timer.current )
+                try:
+                    check.run_check()
+                finally:
+                    if tracer:
+                        tracer.detach()
+                    result['phases'].update( {f'{prefix}{phase}': seconds for ( phase, seconds ) in check.timer.rounded().items()} )
+                    result['page_timing'] = check.page_timing
+                if tracer:
+                    tracer.enforce_budget( spec.get('max_round_trips', settings.ROUND_TRIP_BUDGET) )
+        result['passed'] = True
+    except Exception:
+        log.exception( f'check `{name}` failed; traceback...' )
+        result['error'] = traceback.format_exc()
+    if tracer:
+        result['trace'] = tracer.span_tree()
+        result['round_trips'] = result['trace']['round_trips']
+        log.info( f'`{name}` WebDriver round-trips, ```{ {span["phase"]: span["round_trips"] for span in result["trace"]["phases"]} }```' )
+    result['seconds'] = round( time.monotonic() - start, 3 )
+    return result
+
+
+def run_checks( names, pool, workers=None, incremental=False, executor=None, client=None ):
+    """ Runs the named checks -- serially on `pool`, or spread over `workers` processes, each with its own browser.
+        With `incremental`, checks whose pages and availability data are unchanged since their last passing run are skipped.
+        A long-lived `executor` (see lib/daemon.py) keeps its worker-processes, and their browsers, across calls;
+        a long-lived AsyncClient `client` keeps the warm-up and fingerprint connections open across calls.
+        Returns result-dicts in `names` order.
+        Called by checker.py and lib/daemon.py """
+    if incremental:
+        ( to_run, skipped, current, store ) = fingerprints.select_changed( [CHECKS[name] for name in names], client=client )
+    else:
+        ( to_run, skipped ) = ( list(names), [] )
+    results = dispatch( to_run, pool, workers, executor, client )
+    if incremental:
+        fingerprints.record( results, current, store )
+    by_name = { result['check']: result for result in results + skipped }
+    return [ by_name[name] for name in names ]
+
+
+def dispatch( names, pool, workers=None, executor=None, client=None ):
+    """ Warms up, then runs the checks serially or over worker processes.
+        Called by run_checks() """
+    if not names:
+        return []
+    warmup.warm_up( [CHECKS[name] for name in names], client=client )
+    if executor:
+        return list( executor.map(run_named_check, names) )
+    workers = min( workers or settings.CHECK_WORKERS, len(names) )
+    if workers <= 1:
+        return [ run_named_check(name, pool) for name in names ]
+    log.info( f'running `{len(names)}` checks over `{workers}` worker processes' )
+    with ProcessPoolExecutor( max_workers=workers, initializer=init_worker ) as executor:
+        results = list( executor.map(run_named_check, names) )
+    return results
@@ -0,0 +1,77 @@
+"""
+Check selection, listing and dry-runs for `checker.py` -- straight from the specs, so it imports no browser machinery.
+"""
+
+import logging
+
+from lib import check_engine, page_checks, results_checks
+
+
+log = logging.getLogger(__name__)
+
+
+SPECS = page_checks.SPECS + results_checks.SPECS  # suite order, as lib/runner.py runs them
+
+
+def kind( spec ):
+    return 'results' if 'query' in spec else 'page'
+
+
+def spec_bibs( spec ):
+    """ Returns the bib a page-check loads; results-checks target callnumbers, not bibs, so have none -- their `warm_bibs` are only warmed. """
+    return [ spec['bib'] ] if 'bib' in spec else []
+
+
+def spec_locations( spec ):
+    return list( dict.fromkeys(item['location'] for item in spec['items'] if item.get('location')) )
+
+
+def select( names=None, bibs=None, locations=None, kinds=None ):
+    """ Returns the names of the checks matching every given filter, in suite order; a filter's values are alternatives.
+        Called by checker.py """
+    known = [ spec['name'] for spec in SPECS ]
+    unknown = [ name for name in (names or []) if name not in known ]
+    assert not unknown, f'unknown check(s), ```{unknown}```; see `--list`'
+    wanted_locations = { location.upper() for location in (locations or []) }
+    selected = []
+    for spec in SPECS:
+        if names and spec['name'] not in names:
+            continue
+        if bibs and not set( bibs ) & set( spec_bibs(spec) ):
+            continue
+        if wanted_locations and not wanted_locations & { location.upper() for location in spec_locations(spec) }:
+            continue
+        if kinds and kind( spec ) not in kinds:
+            continue
+        selected.append( spec['name'] )
+    return selected
+
+
+def engine( spec ):
+    """ Returns which driver(s) lib/runner.py would give the spec: `replay`, `http`, `http+browser` or `browser`. """
+    return '+'.join( engine for ( _, engine ) in check_engine.check_parts(spec) )
+
+
+def describe( name ):
+    spec = next( spec for spec in SPECS if spec['name'] == name )
+    return {
+        'check': name, 'kind': kind( spec ), 'bibs': spec_bibs( spec ), 'locations': spec_locations( spec ),
+        'engine': engine( spec ), 'url': check_engine.check_url( spec ), 'warm_urls': check_engine.warm_urls( spec ) }
+
+
+def list_checks( names ):
+    """ Prints one line per check; returns the descriptions. """
+    descriptions = [ describe(name) for name in names ]
+    for d in descriptions:
+        print( f'{d["check"]:<24} {d["kind"]:<8} {",".join(d["bibs"]) or "-":<10} {"; ".join(d["locations"])}' )
+    return descriptions
+
+
+def dry_run( names ):
+    """ Logs what a run of the checks would do -- engine, url and warm-up urls -- without loading anything; returns the descriptions. """
+    descriptions = [ describe(name) for name in names ]
+    for d in descriptions:
+        log.info( f'would run `{d["check"]}` on the {d["engine"]} engine; url, ```{d["url"]}```; warm-up, ```{d["warm_urls"]}```' )
+    needing_browser = sum( 1 for d in descriptions if 'browser' in d['engine'] )
+    log.info( f'dry-run: `{len(descriptions)}` check(s); `{needing_browser}` need a browser' )
+    return descriptions
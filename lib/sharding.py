@@ -0,0 +1,147 @@
+"""
+Deterministic sharding of the check-suite across runner nodes.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ python3 -m lib.sharding durations --output shard_durations.json  # once, from a node with run-history; share the file
+  (each node) $ python3 ./checker.py --shard-index 0 --shard-count 3 --shard-durations shard_durations.json
+  $ python3 -m lib.sharding merge results/shard-*-of-3.json --output results/merged.json
+
+Checks are ordered longest-expected-first (ties broken by a stable hash of the name), then each goes to the least-loaded shard,
+so shards come out balanced by time, not just by count. Every node must compute the same assignment, so expected durations
+come from a shared `--shard-durations` file -- never a node's own history -- and without one, every check counts the same.
+"""
+
+import argparse, datetime, glob, hashlib, json, logging, os, statistics, sys
+
+import settings
+from lib import history
+
+
+log = logging.getLogger(__name__)
+
+
+def stable_hash( name ):
+    return int( hashlib.sha256(name.encode('utf-8')).hexdigest()[:12], 16 )
+
+
+def assign( names, shard_count, durations=None ):
+    """ Returns a list of `shard_count` name-lists; identical on every node given identical inputs.
+        Called by shard_names() """
+    durations = durations or {}
+    known = [ durations[name] for name in names if name in durations ]
+    default = statistics.median( known ) if known else 1.0  # a new check counts as a typical one
+    ordered = sorted( names, key=lambda name: (-durations.get(name, default), stable_hash(name)) )
+    shards = [ [] for _ in range(shard_count) ]
+    loads = [ 0.0 ] * shard_count
+    for name in ordered:
+        target = min( range(shard_count), key=lambda index: (loads[index], index) )
+        shards[target].append( name )
+        loads[target] += durations.get( name, default )
+    return shards
+
+
+def shard_names( names, shard_index, shard_count, durations_path=None ):
+    """ Returns this shard's check-names, in suite order.
+        Called by checker.py """
+    assert 0 <= shard_index < shard_count, f'shard-index `{shard_index}` not within shard-count `{shard_count}`'
+    durations = load_durations( durations_path ) if durations_path else None
+    mine = set( assign(names, shard_count, durations)[shard_index] )
+    selected = [ name for name in names if name in mine ]
+    log.info( f'shard `{shard_index}` of `{shard_count}`: ```{selected}```' )
+    return selected
+
+
+def load_durations( path ):
+    with open( path, 'r' ) as f:
+        return json.loads( f.read() )['durations']
+
+
+def export_durations( output, days=7, path=None ):
+    """ Writes each check's median seconds over the last `days` of run-history, for sharing with every node. """
+    since = ( datetime.datetime.now() - datetime.timedelta(days=days) ).isoformat()
+    with history.connect( path ) as connection:
+        rows = connection.execute(
+            'SELECT check_name, seconds FROM check_results WHERE started_at >= ? AND skipped = 0 AND seconds IS NOT NULL', (since,) ).fetchall()
+    samples = {}
+    for ( name, seconds ) in rows:
+        samples.setdefault( name, [] ).append( seconds )
+    durations = { name: round(statistics.median(values), 3) for ( name, values ) in sorted( samples.items() ) }
+    with open( output, 'w' ) as f:
+        f.write( json.dumps({'exported_at': datetime.datetime.now().isoformat(), 'days': days, 'durations': durations}, indent=2) )
+    log.info( f'median durations of `{len(durations)}` checks written to ```{output}```' )
+    return durations
+
+
+def results_path( shard_index, shard_count ):
+    return os.path.join( settings.RESULTS_DIR, f'shard-{shard_index}-of-{shard_count}.json' )
+
+
+def write_results( results, shard_index, shard_count, started_at, path=None ):
+    """ Writes one shard's results; returns the path.
+        Called by checker.py """
+    path = path or results_path( shard_index, shard_count )
+    os.makedirs( os.path.dirname(os.path.abspath(path)), exist_ok=True )
+    payload = {
+        'shard_index': shard_index, 'shard_count': shard_count, 'started_at': started_at,
+        'finished_at': datetime.datetime.now().isoformat(), 'root_page_url': settings.ROOT_PAGE_URL, 'results': results }
+    with open( path, 'w' ) as f:
+        f.write( json.dumps(payload, indent=2) )
+    log.info( f'shard results written to ```{path}```' )
+    return path
+
+
+def merge( paths ):
+    """ Combines shard result-files into one report; asserts the shards are complete and don't overlap. """
+    shards = []
+    for path in paths:
+        with open( path, 'r' ) as f:
+            shards.append( json.loads(f.read()) )
+    assert shards, 'no shard result-files given'
+    counts = { shard['shard_count'] for shard in shards }
+    assert len( counts ) == 1, f'shard result-files from different shard-counts, ```{sorted(counts)}```'
+    shard_count = counts.pop()
+    indexes = sorted( shard['shard_index'] for shard in shards )
+    assert indexes == list( range(shard_count) ), f'expected shards `0..{shard_count - 1}`, got ```{indexes}```'
+    results = [ result for shard in sorted( shards, key=lambda s: s['shard_index'] ) for result in shard['results'] ]
+    names = [ result['check'] for result in results ]
+    duplicates = sorted( {name for name in names if names.count(name) > 1} )
+    assert not duplicates, f'checks run on more than one shard, ```{duplicates}```'
+    return {
+        'shard_count': shard_count,
+        'started_at': min( shard['started_at'] for shard in shards ),
+        'finished_at': max( shard['finished_at'] for shard in shards ),
+        'checks': len( results ),
+        'failed': [ result['check'] for result in results if not result['passed'] ],
+        'shard_seconds': { shard['shard_index']: round(sum(r['seconds'] or 0 for r in shard['results']), 3) for shard in shards },
+        'results': results }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser( description='Shard-duration export, and shard-result merging.' )
+    subparsers = parser.add_subparsers( dest='command', required=True )
+    durations_parser = subparsers.add_parser( 'durations', help='export per-check median seconds from run-history' )
+    durations_parser.add_argument( '--days', type=int, default=7 )
+    durations_parser.add_argument( '--output', default='shard_durations.json' )
+    merge_parser = subparsers.add_parser( 'merge', help='combine shard result-files into one report' )
+    merge_parser.add_argument( 'paths', nargs='+', help='shard result-files; globs are expanded' )
+    merge_parser.add_argument( '--output', default=os.path.join(settings.RESULTS_DIR, 'merged.json') )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    args = parse_args()
+    if args.command == 'durations':
+        export_durations( args.output, args.days )
+    else:
+        report = merge( sorted({path for pattern in args.paths for path in (glob.glob(pattern) or [pattern])}) )
+        os.makedirs( os.path.dirname(os.path.abspath(args.output)), exist_ok=True )
+        with open( args.output, 'w' ) as f:
+            f.write( json.dumps(report, indent=2) )
+        log.info( f'`{report["checks"]}` checks from `{report["shard_count"]}` shards; failed, ```{report["failed"]}```; shard-seconds, ```{report["shard_seconds"]}```' )
+        log.info( f'merged report written to ```{args.output}```' )
+        sys.exit( 1 if report['failed'] else 0 )
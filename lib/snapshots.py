@@ -0,0 +1,93 @@
+"""
+Record-and-replay page snapshots.
+
+Record mode (`BLK_HAY__SNAPSHOT_MODE=record`) saves the fully rendered DOM of every page a check visits,
+once its availability data has arrived, to a compressed, content-addressed store...
+    <SNAPSHOT_DIR>/objects/<2-char prefix>/<sha256 of html>.html.gz
+    <SNAPSHOT_DIR>/urls/<sha256 of url>.json  -- { url, sha256, recorded_at }
+
+Replay mode (`BLK_HAY__SNAPSHOT_MODE=replay`) runs the same assertions against those snapshots
+with no network and no browser. Urls are stored as navigated, so replay with the `BLK_HAY__ROOT_PAGE_URL` used to record.
+"""
+
+import datetime, gzip, hashlib, json, logging, os, tempfile
+
+import settings
+from lib.http_engine import HttpDriver, parse_html
+
+
+log = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+
+    def __init__( self, root=None ):
+        self.root = root or settings.SNAPSHOT_DIR
+
+    def put( self, url, html ):
+        """ Stores the html (once per distinct content) and points the url at it; returns the content-hash.
+            Called by record() """
+        data = html.encode( 'utf-8' )
+        digest = hashlib.sha256( data ).hexdigest()
+        object_path = self.object_path( digest )
+        if not os.path.exists( object_path ):
+            self.write_atomically( object_path, gzip.compress(data, mtime=0) )
+        entry = { 'url': url, 'sha256': digest, 'recorded_at': datetime.datetime.now().isoformat() }
+        self.write_atomically( self.url_path(url), json.dumps(entry, indent=2).encode('utf-8') )
+        return digest
+
+    def get( self, url ):
+        """ Returns the html recorded for the url; raises KeyError if there is none.
+            Called by ReplayDriver.get() """
+        try:
+            with open( self.url_path(url), 'r' ) as f:
+                entry = json.loads( f.read() )
+        except FileNotFoundError:
+            raise KeyError( f'no snapshot recorded for url, ```{url}```' ) from None
+        with open( self.object_path(entry['sha256']), 'rb' ) as f:
+            return gzip.decompress( f.read() ).decode( 'utf-8' )
+
+    def object_path( self, digest ):
+        return os.path.join( self.root, 'objects', digest[:2], f'{digest}.html.gz' )
+
+    def url_path( self, url ):
+        return os.path.join( self.root, 'urls', f'{hashlib.sha256(url.encode("utf-8")).hexdigest()}.json' )
+
+    def write_atomically( self, path, data ):
+        """ Writes via a temp-file + rename, so parallel workers never see partial files. """
+        os.makedirs( os.path.dirname(path), exist_ok=True )
+        ( fd, temp_path ) = tempfile.mkstemp( dir=os.path.dirname(path) )
+        with os.fdopen( fd, 'wb' ) as f:
+            f.write( data )
+        os.replace( temp_path, path )
+        return
+
+    ## end class SnapshotStore
+
+
+def record( url, driver, store=None ):
+    """ Saves the driver's current rendered DOM for the url.
+        Called by check_engine.BaseCheck.load_page() in record mode. """
+    digest = ( store or SnapshotStore() ).put( url, driver.page_source )
+    log.info( f'recorded snapshot `{digest[:12]}` for url, ```{url}```' )
+    return digest
+
+
+class ReplayDriver( HttpDriver ):
+    """ Serves recorded snapshots through the http engine's lookups -- no network, no browser. """
+
+    def __init__( self, store=None ):
+        self.store = store or SnapshotStore()
+        self.owns_client = False
+        self.client = None
+        self.document = parse_html( '' )
+        self.current_url = None
+        self.page_source = ''
+
+    def get( self, url ):
+        self.current_url = url
+        self.page_source = self.store.get( url )
+        self.document = parse_html( self.page_source, url )
+        return
+
+    ## end class ReplayDriver
@@ -0,0 +1,284 @@
+"""
+Local Blacklight stand-in, for benchmarking and tuning the harness without the real catalog.
+
+Usage: from 'blacklight_hay_FTcode' directory...
+
+  $ python3 -m lib.stand_in_server --port 8099 --latency 0.3 --availability-latency 0.8 --items 40
+  $ export BLK_HAY__ROOT_PAGE_URL=http://127.0.0.1:8099/catalog
+  $ export BLK_HAY__PRODUCTION_ROOT_PAGE_URL=http://127.0.0.1:8099/catalog  # keeps warm-up local too
+  $ export BLK_HAY__AVAILABILITY_URL_PATTERN='http://127.0.0.1:8099/availability/{bib}.json'  # for the tools that call it directly
+  $ export BLK_HAY__AVAILABILITY_LINK_FIELD=request_link  # the stand-in's own link-field
+  $ python3 ./checker.py
+
+Serves, in the markup shape the checks expect...
+- `/catalog/<bib>` -- a bib page: `blacklight-format` fields and `bib_item` rows with server-rendered `location` and `callnumber` cells;
+  the `status` and request-link cells are filled in afterwards by javascript, from the availability endpoint
+- `/catalog?f[format][]=...&q=...` -- search results: `div.document` blocks with a `title-subheading` format and item-tables,
+  paginated by `page` and `per_page` (default 10), with a `rel="next"` link while more pages remain
+- `/availability/<bib>.json` -- the availability data the page-javascript calls
+
+The spec'd bibs and queries from `lib/page_checks.py` and `lib/results_checks.py` are served with their expected values,
+padded with filler items and documents; unknown bibs get filler only.
+"""
+
+import argparse, html, json, logging, time, urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lib import page_checks, request_rules, results_checks
+
+
+log = logging.getLogger(__name__)
+
+
+LINK_CLASSES = [ 'scan', 'jcb_url', 'hay_aeon_url', 'ezb_volume_url', 'annexhay_easyrequest_url' ]
+DEFAULT_ITEM_LIMIT = 10  # items shown on a bib page without `?limit=false`
+DEFAULT_PER_PAGE = 10  # search-results documents per page without `per_page`
+
+FILLER_PATTERNS = [  # ( location, status ) cycled through for filler items
+    ( 'ANNEX HAY', 'AVAILABLE' ),
+    ( 'HAY MANUSCRIPTS', 'USE IN LIBRARY' ),
+    ( 'ANNEX HAY', 'RESTRICTED' ),
+    ( 'HAY ARCHIVES', 'USE IN LIBRARY' ),
+    ( 'HAY MICROFLM', 'USE IN LIBRARY' ) ]
+
+
+## data -------------------------------------------------------------
+
+
+def link_url( link_class, item_id ):
+    """ Returns a request-url of the kind the real catalog builds for the link-class. """
+    if link_class == 'annexhay_easyrequest_url':
+        return f'https://apps.library.brown.edu/easyrequest_hay/confirm/?item_id={item_id}'
+    return f'https://brown.aeon.atlas-sys.com/logon?Action=10&Form=30&item_id={item_id}'
+
+
+def filler_items( bib, count, start=0 ):
+    items = []
+    for n in range( start, start + count ):
+        ( location, status ) = FILLER_PATTERNS[ n % len(FILLER_PATTERNS) ]
+        callnumber = f'Filler Box {n + 1}'
+        items.append( {
+            'id': f'item_{bib}_{n}', 'location': location, 'callnumber': callnumber, 'status': status,
+            'link': request_rules.expected_link( location, status, callnumber ) } )
+    return items
+
+
+def bib_items( bib, total ):
+    """ Returns the bib's items -- spec'd items first, in index-order, then filler up to `total`.
+        Called by the page and availability handlers. """
+    spec = next( (s for s in page_checks.SPECS if s['bib'] == bib), None )
+    items = []
+    for ( n, item ) in enumerate( spec['items'] if spec else [] ):
+        items.append( {
+            'id': item.get( 'item_id' ) or f'item_{bib}_spec_{n}',
+            'location': item['location'], 'callnumber': item['callnumber'], 'status': item['status'], 'link': item['link'] } )
+    return items + filler_items( bib, max(total - len(items), 0) )
+
+
+def results_documents( query, documents, rows, spec_position=0 ):
+    """ Returns the result-documents for a query: filler documents, with the matching results-spec's items as one document at `spec_position`.
+        Called by the results handler. """
+    spec = next( (s for s in results_checks.SPECS if query_term(s['query']) == query), None )
+    found = []
+    if spec:
+        items = []
+        for ( n, item ) in enumerate( spec['items'] ):
+            link = None
+            if item.get( 'request_access' ):
+                link = 'annexhay_easyrequest_url' if 'easyrequest' in item.get( 'href', '' ) or item['location'] == 'ANNEX HAY' else 'hay_aeon_url'
+            items.append( {
+                'id': f'item_{spec["name"]}_{n}', 'location': item['location'], 'callnumber': item['callnumber'],
+                'status': item['status'], 'link': link } )
+        found.append( {'bib': spec['name'], 'title': query, 'items': items + filler_items(spec['name'], max(rows - len(items), 0))} )
+    fillers = []
+    for n in range( max(documents - len(found), spec_position if found else 0) ):  # enough filler to put the spec'd document at its position
+        bib = f'bfiller{n}'
+        fillers.append( {'bib': bib, 'title': f'Filler collection {n}', 'items': filler_items(bib, rows)} )
+    position = min( spec_position, len(fillers) )
+    return fillers[:position] + found + fillers[position:]
+
+
+def document_items( bib, rows ):
+    """ Returns the items of one search-results document, by its bib-key.
+        Called by the availability handler. """
+    spec = next( (s for s in results_checks.SPECS if s['name'] == bib), None )
+    if spec:
+        return results_documents( query_term(spec['query']), 1, rows )[0]['items']
+    return filler_items( bib, rows )
+
+
+def query_term( query_string ):
+    return urllib.parse.parse_qs( query_string ).get( 'q', [''] )[0]
+
+
+## markup -----------------------------------------------------------
+
+
+BIB_PAGE_SCRIPT = """
+<script>
+  fetch( '/availability/%(bib)s.json?limit=%(limit)s' ).then( function(r) { return r.json(); } ).then( function(data) {
+    data.items.forEach( function(item) {
+      var row = document.getElementById( item.id );
+      if ( !row ) { return; }
+      row.querySelector( '.status' ).textContent = item.status;
+      if ( item.request_link ) {
+        row.querySelector( '.' + item.request_link['class'] ).innerHTML = '<a href="' + item.request_link.url + '">request-access</a>';
+      }
+    } );
+  } );
+</script>"""
+
+RESULTS_PAGE_SCRIPT = """
+<script>
+  document.querySelectorAll( 'div.document' ).forEach( function(doc) {
+    fetch( '/availability/' + doc.dataset.bib + '.json?limit=false' ).then( function(r) { return r.json(); } ).then( function(data) {
+      data.items.forEach( function(item) {
+        var cell = doc.querySelector( 'td[data-item="' + item.id + '"]' );
+        if ( !cell ) { return; }
+        cell.innerHTML = item.status + ( item.request_link ? ' <a href="' + item.request_link.url + '">request-access</a>' : '' );
+      } );
+    } );
+  } );
+</script>"""
+
+
+def render_bib_page( bib, items, limit ):
+    rows = []
+    for item in items:
+        link_cells = ''.join( f'<td class="{c}"></td>' for c in LINK_CLASSES )
+        rows.append(
+            f'<tr class="bib_item" id="{html.escape(item["id"])}">'
+            f'<td class="location">{html.escape(item["location"])}</td>'
+            f'<td class="callnumber">{html.escape(item["callnumber"])}</td>'
+            f'<td class="status"></td>{link_cells}</tr>' )
+    return f"""<!DOCTYPE html>
+<html><head><title>{bib}</title></head><body>
+<dl class="document-metadata">
+  <dt class="blacklight-format">Format:</dt>
+  <dd class="blacklight-format">Archives/Manuscripts</dd>
+</dl>
+<table class="items">{''.join(rows)}</table>
+{BIB_PAGE_SCRIPT % {'bib': html.escape(bib), 'limit': 'false' if limit is None else limit}}
+</body></html>"""
+
+
+def render_results_page( query, documents, next_url=None ):
+    blocks = []
+    for doc in documents:
+        rows = ''.join(
+            f'<tr><td>{html.escape(item["location"])}</td><td>{html.escape(item["callnumber"])}</td>'
+            f'<td data-item="{html.escape(item["id"])}"></td></tr>'
+            for item in doc['items'] )
+        blocks.append(
+            f'<div class="document" id="doc_{html.escape(doc["bib"])}" data-bib="{html.escape(doc["bib"])}">'
+            f'<h3 class="index_title">{html.escape(doc["title"])}</h3>'
+            f'<div class="title-subheading">Archives/Manuscripts</div>'
+            f'<table>{rows}</table></div>' )
+    return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(query)}</title></head><body>
+<div id="documents">{''.join(blocks)}</div>
+{f'<ul class="pagination"><li><a rel="next" href="{html.escape(next_url)}">Next &raquo;</a></li></ul>' if next_url else ''}
+{RESULTS_PAGE_SCRIPT}
+</body></html>"""
+
+
+## server -----------------------------------------------------------
+
+
+class StandInHandler( BaseHTTPRequestHandler ):
+
+    config = None  # argparse namespace; set by serve()
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real catalog
+
+    def do_GET( self ):
+        parts = urllib.parse.urlsplit( self.path )
+        params = urllib.parse.parse_qs( parts.query )
+        segments = [ s for s in parts.path.split('/') if s ]
+        if segments[:1] == ['availability'] and len( segments ) == 2 and segments[1].endswith( '.json' ):
+            time.sleep( self.config.availability_latency )
+            return self.availability( segments[1][:-len('.json')], params )
+        if segments == ['catalog']:
+            time.sleep( self.config.latency )
+            return self.results( params )
+        if segments[:1] == ['catalog'] and len( segments ) == 2:
+            time.sleep( self.config.latency )
+            return self.bib_page( segments[1], params )
+        return self.respond( 404, 'text/plain', 'not found' )
+
+    def bib_page( self, bib, params ):
+        limit = None if params.get( 'limit' ) == ['false'] else DEFAULT_ITEM_LIMIT
+        items = bib_items( bib, self.config.items )
+        shown = items if limit is None else items[:limit]
+        return self.respond( 200, 'text/html; charset=utf-8', render_bib_page(bib, shown, limit) )
+
+    def results( self, params ):
+        query = params.get( 'q', [''] )[0]
+        page = max( int(params.get('page', ['1'])[0]), 1 )
+        per_page = max( int(params.get('per_page', [str(DEFAULT_PER_PAGE)])[0]), 1 )
+        documents = results_documents( query, self.config.documents, self.config.rows, self.config.spec_position )
+        shown = documents[ (page - 1) * per_page : page * per_page ]
+        next_url = None
+        if page * per_page < len( documents ):
+            next_params = [ (k, v) for (k, values) in params.items() if k != 'page' for v in values ] + [ ('page', str(page + 1)) ]
+            next_url = '/catalog?' + urllib.parse.urlencode( next_params )
+        return self.respond( 200, 'text/html; charset=utf-8', render_results_page(query, shown, next_url) )
+
+    def availability( self, bib, params ):
+        if bib.startswith( 'bfiller' ) or any( s['name'] == bib for s in results_checks.SPECS ):
+            items = document_items( bib, self.config.rows )
+        else:
+            items = bib_items( bib, self.config.items )
+        payload = { 'bib': bib, 'items': [ {
+            'id': item['id'], 'location': item['location'], 'callnumber': item['callnumber'], 'status': item['status'],
+            'request_link': {'class': item['link'], 'url': link_url(item['link'], item['id'])} if item['link'] else None }
+            for item in items ] }
+        return self.respond( 200, 'application/json', json.dumps(payload) )
+
+    def respond( self, status, content_type, body ):
+        data = body.encode( 'utf-8' )
+        self.send_response( status )
+        self.send_header( 'Content-Type', content_type )
+        self.send_header( 'Content-Length', str(len(data)) )
+        self.end_headers()
+        self.wfile.write( data )
+        return
+
+    def log_message( self, format, *args ):
+        log.debug( format % args )
+
+    ## end class StandInHandler
+
+
+def serve( config ):
+    StandInHandler.config = config
+    server = ThreadingHTTPServer( (config.host, config.port), StandInHandler )
+    server.daemon_threads = True
+    log.info( f'stand-in catalog at ```http://{config.host}:{config.port}/catalog```' )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return
+
+
+def parse_args( argv=None ):
+    parser = argparse.ArgumentParser( description='Local Blacklight stand-in for benchmarking the harness.' )
+    parser.add_argument( '--host', default='127.0.0.1' )
+    parser.add_argument( '--port', type=int, default=8099 )
+    parser.add_argument( '--latency', type=float, default=0.0, help='seconds added to every page response' )
+    parser.add_argument( '--availability-latency', type=float, default=0.0, help='seconds added to every availability response' )
+    parser.add_argument( '--items', type=int, default=20, help='items per bib page, spec items included' )
+    parser.add_argument( '--documents', type=int, default=10, help='documents per search query, over all its pages; grown to reach `--spec-position`' )
+    parser.add_argument( '--rows', type=int, default=10, help='item rows per search-results document' )
+    parser.add_argument( '--spec-position', type=int, default=0, help='0-based position of the spec\'d document among the results; eg 12 puts it on page 2, at the default `per_page` of 10' )
+    return parser.parse_args( argv )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(module)s-%(funcName)s()::%(lineno)d] %(message)s',
+        datefmt='%d/%b/%Y %H:%M:%S' )
+    serve( parse_args() )
@@ -0,0 +1,22 @@
+import math, statistics
+
+
+def percentile( values, pct ):
+    """ Nearest-rank percentile; None for no values. """
+    if not values:
+        return None
+    ordered = sorted( values )
+    rank = max( math.ceil(pct / 100.0 * len(ordered)), 1 )
+    return ordered[ rank - 1 ]
+
+
+def summarize( values, digits=4 ):
+    """ Returns count, median, p95, min and max of the values. """
+    if not values:
+        return { 'count': 0, 'median': None, 'p95': None, 'min': None, 'max': None }
+    return {
+        'count': len( values ),
+        'median': round( statistics.median(values), digits ),
+        'p95': round( percentile(values, 95), digits ),
+        'min': round( min(values), digits ),
+        'max': round( max(values), digits ) }
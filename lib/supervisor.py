@@ -0,0 +1,106 @@
+"""
+Browser resource supervision, for `lib/browser_pool.py`.
+
+- `BrowserRecord`: per-browser pages served, and memory/cpu samples of its process-tree (see lib/proc_stats.py)
+- recycling: a browser past `BLK_HAY__BROWSER_MAX_PAGES` pages, or `BLK_HAY__BROWSER_MAX_RSS_MB` megabytes, is quit and replaced on next use
+- `reap_orphans()`: kills geckodriver/marionette-firefox processes left behind by earlier runs that died without quitting their browsers;
+  an orphan is one re-parented to PID 1, so reaping is skipped when PID 1 is itself this harness -- eg `checker.py --daemon` as a
+  container's entrypoint -- whose live browsers look just the same
+"""
+
+import logging, os, signal, time
+
+import settings
+from lib import proc_stats
+
+
+log = logging.getLogger(__name__)
+
+
+class BrowserRecord:
+
+    def __init__( self, browser ):
+        self.pid = proc_stats.browser_pid( browser )
+        self.launched_at = time.monotonic()
+        self.pages = 0
+        self.usage = None  # latest proc_stats.tree_usage() reading
+        self.peak_rss_mb = 0.0
+
+    def sample( self ):
+        """ Counts a page served and reads the browser's process-tree usage.
+            Called by BrowserPool.release() """
+        self.pages += 1
+        self.usage = proc_stats.tree_usage( self.pid )
+        if self.usage:
+            self.peak_rss_mb = max( self.peak_rss_mb, self.usage['rss_mb'] )
+            log.debug( f'browser `{self.pid}` after page `{self.pages}`, ```{self.usage}```' )
+        return self.usage
+
+    def recycle_reason( self ):
+        """ Returns why the browser should be replaced, or None. """
+        if settings.BROWSER_MAX_PAGES and self.pages >= settings.BROWSER_MAX_PAGES:
+            return f'served `{self.pages}` pages'
+        if settings.BROWSER_MAX_RSS_MB and self.usage and self.usage['rss_mb'] >= settings.BROWSER_MAX_RSS_MB:
+            return f'using `{self.usage["rss_mb"]}` MB'
+        return None
+
+    def summary( self ):
+        return {
+            'pid': self.pid, 'pages': self.pages, 'seconds_alive': round( time.monotonic() - self.launched_at, 1 ),
+            'peak_rss_mb': self.peak_rss_mb, 'cpu_seconds': self.usage['cpu_seconds'] if self.usage else None }
+
+    ## end class BrowserRecord
+
+
+def read_cmdline( pid ):
+    try:
+        with open( f'/proc/{pid}/cmdline', 'rb' ) as f:
+            return [ part.decode('utf-8', 'replace') for part in f.read().split(b'\0') if part ]
+    except OSError:
+        return []
+
+
+def is_orphan_browser( pid, ppid ):
+    """ Returns True for a geckodriver, or a webdriver-driven firefox, whose parent died -- re-parented to init -- owned by this user. """
+    if ppid != 1 or pid == os.getpid():
+        return False
+    try:
+        if os.stat( f'/proc/{pid}' ).st_uid != os.getuid():
+            return False
+    except OSError:
+        return False
+    cmdline = read_cmdline( pid )
+    if not cmdline:
+        return False
+    program = os.path.basename( cmdline[0] )
+    return program == 'geckodriver' or ( program.startswith('firefox') and any(arg.lstrip('-') == 'marionette' for arg in cmdline[1:]) )
+
+
+def init_is_harness():
+    """ Returns True if PID 1 is a `checker.py` or `python3 -m lib.<module>` process of this harness. """
+    return any( os.path.basename(arg) == 'checker.py' or arg.startswith('lib.') for arg in read_cmdline(1)[1:] )
+
+
+def reap_orphans():
+    """ Kills orphaned geckodriver/firefox process-trees; returns the pids signalled. Does nothing when disabled, or without `/proc`.
+        Called at start-up by checker.py and lib/daemon.py """
+    if not settings.BROWSER_REAP_ORPHANS or not os.path.isdir( '/proc' ):
+        return []
+    if init_is_harness():
+        log.info( 'PID 1 is a harness process, so its browsers would look orphaned; not reaping' )
+        return []
+    reaped = []
+    for entry in os.listdir( '/proc' ):
+        if not entry.isdigit():
+            continue
+        stat = proc_stats.read_stat( int(entry) )
+        if stat and is_orphan_browser( int(entry), stat[0] ):
+            for pid in reversed( proc_stats.process_tree(int(entry)) ):  # children first
+                try:
+                    os.kill( pid, signal.SIGKILL )
+                    reaped.append( pid )
+                except OSError:
+                    pass
+    if reaped:
+        log.warning( f'reaped `{len(reaped)}` orphaned browser process(es), ```{reaped}```' )
+    return reaped
@@ -0,0 +1,28 @@
+import contextlib, time
+
+
+class PhaseTimer:
+    """ Accumulates wall-clock seconds per named phase, eg `navigation`, `extract`, `assert`. """
+
+    def __init__( self ):
+        self.timings = {}
+        self.active = []  # stack of running phase-names
+
+    @property
+    def current( self ):
+        return self.active[-1] if self.active else None
+
+    @contextlib.contextmanager
+    def phase( self, name ):
+        start = time.perf_counter()
+        self.active.append( name )
+        try:
+            yield
+        finally:
+            self.active.pop()
+            self.timings[name] = self.timings.get( name, 0.0 ) + ( time.perf_counter() - start )
+
+    def rounded( self, digits=4 ):
+        return { name: round(seconds, digits) for (name, seconds) in self.timings.items() }
+
+    ## end class PhaseTimer
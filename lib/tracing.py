@@ -0,0 +1,84 @@
+"""
+WebDriver command tracing.
+
+Every WebDriver command -- element-level ones included -- goes through the driver's `execute()`,
+so wrapping that one method records each round-trip to geckodriver: its command-type, target, wire-time, and the check and phase it belongs to.
+A check's records roll up into a span-tree (check -> phases -> commands), and can be held to a round-trip budget.
+"""
+
+import logging, time
+
+
+log = logging.getLogger(__name__)
+
+
+class RoundTripBudgetExceeded( AssertionError ):
+    pass
+
+
+def describe_target( params ):
+    """ Returns a short description of what a command acted on, eg a locator, url or element-id. """
+    params = params or {}
+    if 'using' in params:
+        return f'{params["using"]}={params.get("value")}'
+    if 'url' in params:
+        return params['url']
+    if 'script' in params:
+        return f'script[{len(params["script"])} chars]'
+    if 'id' in params:
+        return f'element={params["id"]}'
+    return None
+
+
+class CommandTracer:
+
+    def __init__( self, browser, check_name, phase_of=None ):
+        self.browser = browser
+        self.check_name = check_name
+        self.phase_of = phase_of or ( lambda: None )
+        self.records = []
+        self.original_execute = browser.execute
+        browser.execute = self.execute  # instance-attribute shadows the method for this browser only
+
+    def execute( self, driver_command, params=None ):
+        start = time.perf_counter()
+        try:
+            return self.original_execute( driver_command, params )
+        finally:
+            self.records.append( {
+                'check': self.check_name,
+                'phase': self.phase_of(),
+                'command': driver_command,
+                'target': describe_target( params ),
+                'seconds': round( time.perf_counter() - start, 4 ) } )
+
+    def detach( self ):
+        """ Restores the browser's own `execute()`, before it goes back to the pool. """
+        if self.browser.__dict__.get( 'execute' ) == self.execute:
+            del self.browser.execute
+        return
+
+    def span_tree( self ):
+        """ Returns { check, round_trips, seconds, phases: [ { phase, round_trips, seconds, commands: [...] } ] }, phases in first-seen order. """
+        phases = {}
+        for record in self.records:
+            name = record['phase'] or 'other'
+            span = phases.setdefault( name, {'phase': name, 'round_trips': 0, 'seconds': 0.0, 'commands': []} )
+            span['round_trips'] += 1
+            span['seconds'] = round( span['seconds'] + record['seconds'], 4 )
+            span['commands'].append( {k: record[k] for k in ('command', 'target', 'seconds')} )
+        return {
+            'check': self.check_name,
+            'round_trips': len( self.records ),
+            'seconds': round( sum(r['seconds'] for r in self.records), 4 ),
+            'phases': list( phases.values() ) }
+
+    def enforce_budget( self, budget ):
+        """ Fails the check if it used more round-trips than `budget`; a falsy budget means none. """
+        if budget and len( self.records ) > budget:
+            per_phase = { span['phase']: span['round_trips'] for span in self.span_tree()['phases'] }
+            raise RoundTripBudgetExceeded(
+                f'`{self.check_name}` used `{len(self.records)}` WebDriver round-trips; budget is `{budget}`; per phase, ```{per_phase}```' )
+        return
+
+    ## end class CommandTracer
@@ -0,0 +1,64 @@
+"""
+Run-level availability-cache warm-up.
+
+Collects every spec's `warm_bibs` urls, drops duplicates, and fetches them in one concurrent burst over plain http,
+before any check runs -- replacing the serial per-check `blast_limits()` browser navigations.
+"""
+
+import asyncio, logging, time
+
+import settings
+from lib import check_engine
+from lib.async_http import AsyncClient
+
+
+log = logging.getLogger(__name__)
+
+
+def collect_warm_urls( specs ):
+    """ Returns the specs' warm-up urls, de-duplicated, in first-seen order.
+        Called by warm_up() """
+    urls = []
+    for spec in specs:
+        for url in check_engine.warm_urls( spec ):
+            if url not in urls:
+                urls.append( url )
+    return urls
+
+
+async def fetch_all( client, urls ):
+    """ Fetches the urls concurrently; returns one result-dict per url.
+        Called by warm_up() """
+    async def fetch( url ):
+        result = { 'url': url, 'status': None, 'seconds': None, 'error': None }
+        start = time.monotonic()
+        try:
+            response = await client.get( url )
+            result['status'] = response.status
+        except Exception as e:
+            result['error'] = repr( e )
+        result['seconds'] = round( time.monotonic() - start, 3 )
+        return result
+    return await asyncio.gather( *[fetch(url) for url in urls] )
+
+
+def warm_up( specs, concurrency=None, client=None ):
+    """ Warms the availability cache for all the specs at once; failures are logged, not raised.
+        A passed-in AsyncClient (see lib/daemon.py) is left open, its connections warm for the next call.
+        Called by runner.dispatch() and bench.py """
+    urls = collect_warm_urls( specs )
+    if not urls or settings.SNAPSHOT_MODE == 'replay':  # replay runs never touch the network
+        return []
+    owns_client = client is None
+    client = client or AsyncClient( concurrency or settings.WARMUP_CONCURRENCY )
+    start = time.monotonic()
+    try:
+        results = asyncio.run( fetch_all(client, urls) )
+    finally:
+        if owns_client:
+            client.close()
+    for result in results:
+        if result['error'] or result['status'] >= 400:
+            log.warning( f'warm-up problem, ```{result}```' )
+    log.info( f'warmed `{len(urls)}` url(s) in `{round(time.monotonic() - start, 3)}` seconds' )
+    return results
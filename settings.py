@@ -1,6 +1,61 @@
-import os
+import os, urllib.parse
 
 ROOT_PAGE_URL = os.environ['BLK_HAY__ROOT_PAGE_URL']
-PRODUCTION_ROOT_PAGE_URL = 'https://search.library.brown.edu/catalog'
+PRODUCTION_ROOT_PAGE_URL = os.environ.get( 'BLK_HAY__PRODUCTION_ROOT_PAGE_URL', 'https://search.library.brown.edu/catalog' )
 
 BROWSER_WAIT_SECONDS = int( os.environ['BLK_HAY__BROWSER_WAIT'] )
+
+BROWSER_POOL_SIZE = int( os.environ.get('BLK_HAY__BROWSER_POOL_SIZE', '1') )  # max browsers launched per run
+
+CHECK_WORKERS = int( os.environ.get('BLK_HAY__CHECK_WORKERS', '1') )  # worker processes, each with its own browser
+
+CHECK_ENGINE = os.environ.get( 'BLK_HAY__CHECK_ENGINE', 'auto' )  # `auto`: server-rendered assertions over plain http, only javascript-filled ones on a browser; `browser`: all on a browser
+
+WARMUP_CONCURRENCY = int( os.environ.get('BLK_HAY__WARMUP_CONCURRENCY', '8') )  # parallel availability-cache warm-up fetches
+
+SNAPSHOT_MODE = os.environ.get( 'BLK_HAY__SNAPSHOT_MODE', '' )  # '', `record`, or `replay`; see lib/snapshots.py
+SNAPSHOT_DIR = os.environ.get( 'BLK_HAY__SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots') )
+
+TRACE_COMMANDS = os.environ.get( 'BLK_HAY__TRACE_COMMANDS', '1' ) == '1'  # record every WebDriver command per check; see lib/tracing.py
+ROUND_TRIP_BUDGET = int( os.environ.get('BLK_HAY__ROUND_TRIP_BUDGET', '0') )  # per-check WebDriver round-trip limit; 0 means none; a spec's `max_round_trips` overrides
+
+AVAILABILITY_URL_PATTERN = os.environ.get(  # the availability data-source the page-javascript calls, `{bib}` filled in; no default -- required by lib/availability_checker.py
+    'BLK_HAY__AVAILABILITY_URL_PATTERN', '' )
+AVAILABILITY_LINK_FIELD = os.environ.get( 'BLK_HAY__AVAILABILITY_LINK_FIELD', '' )  # the availability payload's request-link field; no default -- unconfirmed, so reported links aren't read
+AVAILABILITY_CONCURRENCY = int( os.environ.get('BLK_HAY__AVAILABILITY_CONCURRENCY', '8') )
+
+FINGERPRINT_PATH = os.environ.get(  # per-check page/availability fingerprints, for `--incremental` runs
+    'BLK_HAY__FINGERPRINT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fingerprints.json') )
+
+DAEMON_INTERVAL = int( os.environ.get('BLK_HAY__DAEMON_INTERVAL', '90') )  # `--daemon` seconds between run-starts
+DAEMON_JITTER = int( os.environ.get('BLK_HAY__DAEMON_JITTER', '15') )  # plus-or-minus seconds added to each interval
+DAEMON_MAX_BACKOFF = int( os.environ.get('BLK_HAY__DAEMON_MAX_BACKOFF', '900') )  # longest interval while the catalog is degraded
+DAEMON_DEGRADED_FRACTION = float( os.environ.get('BLK_HAY__DAEMON_DEGRADED_FRACTION', '0.5') )  # failing-check share that counts as degraded
+DAEMON_STATUS_PORT = int( os.environ.get('BLK_HAY__DAEMON_STATUS_PORT', '0') )  # serve `/status` json on this localhost port; 0 means off
+
+LEAN_BROWSER = os.environ.get( 'BLK_HAY__LEAN_BROWSER', '0' ) == '1'  # block images, fonts and non-catalog requests; see lib/browser_pool.py
+LEAN_BLOCK_STYLESHEETS = os.environ.get( 'BLK_HAY__LEAN_BLOCK_STYLESHEETS', '0' ) == '1'  # lean browsers skip css too
+LEAN_ALLOW_HOSTS = [  # lean browsers only reach these hosts; empty means any host not denied -- the default unless the availability host is known
+    host for host in os.environ.get( 'BLK_HAY__LEAN_ALLOW_HOSTS', ','.join(sorted({
+        urllib.parse.urlsplit(ROOT_PAGE_URL).hostname, urllib.parse.urlsplit(AVAILABILITY_URL_PATTERN).hostname})) if AVAILABILITY_URL_PATTERN else '' ).split( ',' ) if host ]
+LEAN_DENY_PATTERNS = [  # url shell-patterns lean browsers never fetch, even from allowed hosts
+    pattern for pattern in os.environ.get( 'BLK_HAY__LEAN_DENY_PATTERNS', '*google-analytics.com*,*googletagmanager.com*,*.woff*,*.ttf*' ).split( ',' ) if pattern ]
+
+BROWSER_MAX_PAGES = int( os.environ.get('BLK_HAY__BROWSER_MAX_PAGES', '50') )  # recycle a browser after this many checks; 0 means never
+BROWSER_MAX_RSS_MB = int( os.environ.get('BLK_HAY__BROWSER_MAX_RSS_MB', '1500') )  # recycle a browser whose process-tree uses more; 0 means never
+BROWSER_REAP_ORPHANS = os.environ.get( 'BLK_HAY__BROWSER_REAP_ORPHANS', '1' ) == '1'  # kill leftover geckodriver/firefox at start-up
+
+HISTORY_DB = os.environ.get(  # sqlite run-history, see lib/history.py; '' turns recording off
+    'BLK_HAY__HISTORY_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.sqlite3') )
+
+LOADGEN_REFUSED_HOSTS = [  # hosts lib/loadgen.py will never load-test
+    host for host in os.environ.get( 'BLK_HAY__LOADGEN_REFUSED_HOSTS', 'search.library.brown.edu' ).split( ',' ) if host ]
+
+RESULTS_DIR = os.environ.get(  # per-shard result-files, and their merged report; see lib/sharding.py
+    'BLK_HAY__RESULTS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results') )
+
+FAILURES_PATH = os.environ.get(  # checks that failed their latest run, for `--rerun-failed`; see lib/failures.py
+    'BLK_HAY__FAILURES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'failures.json') )
+
+RESULTS_PER_PAGE = int( os.environ.get('BLK_HAY__RESULTS_PER_PAGE', '0') )  # `per_page` sent with results-checks; 0 means the catalog's default
+RESULTS_MAX_PAGES = int( os.environ.get('BLK_HAY__RESULTS_MAX_PAGES', '5') )  # results-pages crawled looking for target callnumbers